@@ -0,0 +1,129 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Closest Point of Approach screening for whole fleets
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      A fleet is an N x 4 array of [latitude, longitude, course, speed] rows.
+ *      Every pair is solved with NavBatch.CalculateCPA; the work is done in
+ *      blocks of approach rows so that memory stays bounded for large fleets.
+ *      The Near screens prune pairs with a SpatialGrid first: two tracks
+ *      can only close to within the alert range inside the look-ahead
+ *      horizon if they are now within alertRange + 2 * maxSpeed * horizon.
+ *****************************************************************************
+'''
+import numpy as np
+from NavBatch import NavBatch
+from NavBatch import CPA_DTYPE
+from SpatialGrid import SpatialGrid
+
+# CPA result for an indexed (approach, target) pair of fleet members
+CPA_PAIR_DTYPE = np.dtype([('approach', np.int64), ('target', np.int64)] + CPA_DTYPE.descr)
+
+class CPAScreen(NavBatch):
+
+    def __init__(self, blockSize = 1 << 20):
+        # Number of pairs solved per NavBatch.CalculateCPA call
+        self.blockSize = blockSize
+
+    def fleetArray(self, theFleet):
+        """ Convert a fleet to an N x 4 float64 array of [lat, lon, course, speed] rows. """
+        fleet = np.asarray(theFleet, dtype=np.float64)
+        if fleet.ndim != 2 or fleet.shape[1] != 4:
+            raise ValueError("Fleet must be an N x 4 array of [lat, lon, course, speed]")
+        return fleet
+
+    def screenFleets(self, theApproachFleet, theTargetFleet):
+        """
+            Compute the CPA of every approach track against every target track.
+            Returns an N x M CPA_DTYPE structured array; element [i, j] is the CPA of
+            approach i relative to target j.
+        """
+        approach = self.fleetArray(theApproachFleet)
+        target = self.fleetArray(theTargetFleet)
+        output = np.empty((len(approach), len(target)), dtype=CPA_DTYPE)
+        if len(target) == 0:
+            return output
+
+        rows = max(1, self.blockSize // len(target))
+        for start in range(0, len(approach), rows):
+            block = approach[start:start + rows, None, :]
+            output[start:start + rows] = self.CalculateCPA(block[..., 0:2], block[..., 2], block[..., 3],
+                                                           target[None, :, 0:2], target[None, :, 2], target[None, :, 3])
+        return output
+
+    def screenPairs(self, theApproachFleet, theTargetFleet, approachIx, targetIx):
+        """
+            Compute the CPA for the listed pairs only: approach track approachIx[k] against
+            target track targetIx[k].  Returns a 1-D CPA_PAIR_DTYPE structured array.
+        """
+        approach = self.fleetArray(theApproachFleet)
+        target = self.fleetArray(theTargetFleet)
+        approachIx = np.asarray(approachIx, dtype=np.int64)
+        targetIx = np.asarray(targetIx, dtype=np.int64)
+
+        output = np.empty(len(approachIx), dtype=CPA_PAIR_DTYPE)
+        output['approach'] = approachIx
+        output['target'] = targetIx
+        for start in range(0, len(approachIx), self.blockSize):
+            a = approach[approachIx[start:start + self.blockSize]]
+            t = target[targetIx[start:start + self.blockSize]]
+            cpa = self.CalculateCPA(a[:, 0:2], a[:, 2], a[:, 3], t[:, 0:2], t[:, 2], t[:, 3])
+            for name in CPA_DTYPE.names:
+                output[name][start:start + self.blockSize] = cpa[name]
+        return output
+
+    def screenFleet(self, theFleet):
+        """
+            Compute the CPA between all distinct members of one fleet (the upper triangle,
+            approach i < target j).  Returns a 1-D CPA_PAIR_DTYPE structured array.
+        """
+        fleet = self.fleetArray(theFleet)
+        approachIx, targetIx = np.triu_indices(len(fleet), k=1)
+        return self.screenPairs(fleet, fleet, approachIx, targetIx)
+
+    def screeningDistance(self, theSpeeds, theHorizon, theAlertRange):
+        """ Largest current separation (NM) at which a pair can still close to the alert range. """
+        max_speed = float(np.max(theSpeeds, initial=0.0))
+        return theAlertRange + 2.0 * max_speed * theHorizon
+
+    def screenFleetNear(self, theFleet, theHorizon, theAlertRange = 0.0):
+        """
+            Like screenFleet, but only pairs that could close to within theAlertRange (NM)
+            during the next theHorizon hours are evaluated.  Returns a 1-D CPA_PAIR_DTYPE array.
+        """
+        fleet = self.fleetArray(theFleet)
+        cell = self.screeningDistance(fleet[:, 3], theHorizon, theAlertRange)
+        grid = SpatialGrid(fleet[:, 0], fleet[:, 1], cell)
+        approachIx, targetIx = grid.pairs()
+        return self.screenPairs(fleet, fleet, approachIx, targetIx)
+
+    def screenFleetsNear(self, theApproachFleet, theTargetFleet, theHorizon, theAlertRange = 0.0):
+        """
+            Like screenFleets, but only pairs that could close to within theAlertRange (NM)
+            during the next theHorizon hours are evaluated.  Returns a 1-D CPA_PAIR_DTYPE array.
+        """
+        approach = self.fleetArray(theApproachFleet)
+        target = self.fleetArray(theTargetFleet)
+        speeds = np.concatenate((approach[:, 3], target[:, 3]))
+        cell = self.screeningDistance(speeds, theHorizon, theAlertRange)
+        grid = SpatialGrid(target[:, 0], target[:, 1], cell)
+        approachIx, targetIx = grid.queryPairs(approach[:, 0], approach[:, 1])
+        order = np.lexsort((targetIx, approachIx))
+        return self.screenPairs(approach, target, approachIx[order], targetIx[order])
+
+
+if __name__ == '__main__':
+    screen = CPAScreen()
+    fleet = [[36.0, -75.0, 90.0, 12.0],
+             [36.0, -74.5, 270.0, 10.0],
+             [36.2, -74.8, 180.0, 8.0]]
+    for cpa in screen.screenFleet(fleet):
+        print(cpa)
+    print("Within 5 NM in the next hour:")
+    for cpa in screen.screenFleetNear(fleet, 1.0, 5.0):
+        print(cpa)
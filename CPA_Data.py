@@ -17,19 +17,21 @@ class CPA_State(Enum):
     VALID = 1               # Vessels are approaching each other
     RECEDING = 2            #             moving away from each other
     NO_RELATIVE_MOTION = 3  #             moving parallel to each other or are at rest.
+    INVALID = 4             # A track is above or below 85 degrees latitude (batch results only)
 
 
 class CPAData():
+    __slots__ = ('cpaPosition', 'distToCPA', 'elapsedTime', 'rangeAtCPA', 'code')
 
     def __init__(self):
-        self.cpaPosition = GeographicPosition()
+        self.cpaPosition = None  # A default position is only made if one is asked for
         self.distToCPA = 0.0
         self.elapsedTime = 0.0
         self.rangeAtCPA = 0.0
         self.code = CPA_State.VALID
         
     def __equals__(self, other):
-        result = self.cpaPosition == other.cpaPosition
+        result = self.getCpaPosition() == other.getCpaPosition()
         result = result and self.distToCPA == other.distToCPA
         result = result and self.rangeAtCPA == other.rangeAtCPA and self.code == other.code
         return result
@@ -37,11 +39,15 @@ class CPAData():
     def setCpaPosition(self, *args):
         if (len(args) == 1):
             self.cpaPosition = args[0]
+        elif self.cpaPosition is None:
+            self.cpaPosition = GeographicPosition(args[0], args[1])
         else:
             self.cpaPosition.setLatitude(args[0])
             self.cpaPosition.setLongitude(args[1])
     
     def getCpaPosition(self):
+        if self.cpaPosition is None:
+            self.cpaPosition = GeographicPosition()
         return self.cpaPosition
 
     def setDistToCPA(self, theDistToCPA):
@@ -72,7 +78,7 @@ class CPAData():
         return self.code.name
     
     def toString(self):
-        astr = self.cpaPosition.toString() + "\n"
+        astr = self.getCpaPosition().toString() + "\n"
         astr += "Distance to CPA = " + str(self.distToCPA) + "\n"
         astr += "Range to CPA = " + str(self.rangeAtCPA) + "\n"
         astr += "Elapsed Time = " + str(self.elapsedTime) + "\n"
@@ -0,0 +1,161 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Test arrays of positions against many geofence polygons at once
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Fences are polygons in lat/lon (e.g. Geometry.convexHull output or a
+ *      hand-drawn list of Points), closed implicitly from the last vertex
+ *      back to the first.  Each is stored with its longitudes unwrapped
+ *      (Geometry.unwrapLongitudes), its bounding box and its edges packed
+ *      into one array.  A position is first checked against the bounding
+ *      box, after shifting its longitude into the fence's frame, so fences
+ *      crossing the antimeridian need no special case.  Positions inside
+ *      the box are resolved with the winding number, using the isLeft cross
+ *      product of Geometry, evaluated for a block of positions against all
+ *      the edges of the fence at once.
+ *      Positions exactly on a fence edge may test either way.  A fence must
+ *      span less than 360 degrees of longitude (no fences around a pole).
+ *****************************************************************************
+'''
+import numpy as np
+from Geometry import Geometry
+
+class GeofenceIndex(Geometry):
+
+    def __init__(self, theFences = (), blockSize = 1 << 20):
+        # Number of position/edge pairs evaluated at a time
+        self.blockSize = blockSize
+        self.edgeStart = [0]
+        self.south = []
+        self.north = []
+        self.west = []
+        self.east = []
+        self.edgeParts = []
+        self.edges = np.empty((0, 4), dtype=np.float64)
+        for fence in theFences:
+            self.addFence(fence)
+
+    def addFence(self, thePolygon):
+        """
+            Add a polygon, given as a list of Points (or a Track) with at least three
+            vertices.  Returns the fence number.
+        """
+        if hasattr(thePolygon, 'latitudes'):
+            lat = np.array(thePolygon.latitudes(), dtype=np.float64)
+            lon = self.unwrapLongitudes(thePolygon.longitudes())
+        else:
+            lat = np.fromiter((p.getLatitude() for p in thePolygon), dtype=np.float64, count=len(thePolygon))
+            lon = self.unwrapLongitudes([p.getLongitude() for p in thePolygon])
+        if len(lat) < 3:
+            raise ValueError("A geofence needs at least three vertices")
+
+        self.south.append(lat.min())
+        self.north.append(lat.max())
+        self.west.append(lon.min())
+        self.east.append(lon.max())
+        # Edge k runs from vertex k to vertex k + 1: [x0, y0, x1, y1]
+        self.edgeParts.append(np.column_stack((lon, lat, np.roll(lon, -1), np.roll(lat, -1))))
+        self.edgeStart.append(self.edgeStart[-1] + len(lat))
+        return len(self.south) - 1
+
+    def size(self):
+        return len(self.south)
+
+    def fenceEdges(self, theFence):
+        if len(self.edgeParts) > 0:
+            self.edges = np.concatenate([self.edges] + self.edgeParts)
+            self.edgeParts = []
+        return self.edges[self.edgeStart[theFence]:self.edgeStart[theFence + 1]]
+
+    def windingNumbers(self, theFence, theLatitudes, theLongitudes):
+        """
+            Winding number of the fence around each position, whose longitudes must
+            already be in the fence's frame.  Non-zero means inside.
+        """
+        edges = self.fenceEdges(theFence)
+        x0 = edges[:, 0]
+        y0 = edges[:, 1]
+        x1 = edges[:, 2]
+        y1 = edges[:, 3]
+        winding = np.zeros(len(theLatitudes), dtype=np.int64)
+        rows = max(1, self.blockSize // len(edges))
+        for start in range(0, len(theLatitudes), rows):
+            py = theLatitudes[start:start + rows, None]
+            px = theLongitudes[start:start + rows, None]
+            # isLeft: > 0 when the position is left of the edge
+            left = (x1 - x0) * (py - y0) - (px - x0) * (y1 - y0)
+            upward = (y0 <= py) & (y1 > py) & (left > 0.0)
+            downward = (y0 > py) & (y1 <= py) & (left < 0.0)
+            winding[start:start + rows] = upward.sum(axis=1) - downward.sum(axis=1)
+        return winding
+
+    def sortPositions(self, theLatitudes, theLongitudes):
+        """
+            Return [latitudes, longitudes, order, sortedLatitudes]: the positions as flat
+            arrays, the order that sorts them by latitude and the sorted latitudes.
+        """
+        lat = np.asarray(theLatitudes, dtype=np.float64).ravel()
+        lon = np.asarray(theLongitudes, dtype=np.float64).ravel()
+        order = np.argsort(lat, kind='stable')
+        return [lat, lon, order, lat[order]]
+
+    def candidates(self, theFence, theLongitudes, theOrder, theSortedLatitudes):
+        """
+            Return [indices, longitudes] of the positions inside the fence's bounding box;
+            the positions are sorted by latitude, so the fence's band is a bisection.
+        """
+        first = np.searchsorted(theSortedLatitudes, self.south[theFence], side='left')
+        last = np.searchsorted(theSortedLatitudes, self.north[theFence], side='right')
+        ix = theOrder[first:last]
+        west = self.west[theFence]
+        lon = west + np.mod(theLongitudes[ix] - west, 360.0)
+        inside = lon <= self.east[theFence]
+        return [ix[inside], lon[inside]]
+
+    def contains(self, theLatitudes, theLongitudes):
+        """
+            Test every position against every fence.  Returns an N x F boolean array;
+            element [i, f] is True if position i is inside fence f.
+        """
+        lat, lon, order, sorted_lat = self.sortPositions(theLatitudes, theLongitudes)
+        output = np.zeros((len(lat), self.size()), dtype=bool)
+        for fence in range(self.size()):
+            ix, flon = self.candidates(fence, lon, order, sorted_lat)
+            if len(ix) > 0:
+                output[ix, fence] = self.windingNumbers(fence, lat[ix], flon) != 0
+        return output
+
+    def hits(self, theLatitudes, theLongitudes):
+        """
+            Sparse form of contains: returns [positionIx, fenceIx], one entry per position
+            inside a fence, sorted by position then fence.
+        """
+        lat, lon, order, sorted_lat = self.sortPositions(theLatitudes, theLongitudes)
+        position_ix = []
+        fence_ix = []
+        for fence in range(self.size()):
+            ix, flon = self.candidates(fence, lon, order, sorted_lat)
+            if len(ix) > 0:
+                ix = ix[self.windingNumbers(fence, lat[ix], flon) != 0]
+                position_ix.append(ix)
+                fence_ix.append(np.full(len(ix), fence, dtype=np.int64))
+        if len(position_ix) == 0:
+            return [np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)]
+        position_ix = np.concatenate(position_ix)
+        fence_ix = np.concatenate(fence_ix)
+        order = np.lexsort((fence_ix, position_ix))
+        return [position_ix[order], fence_ix[order]]
+
+
+if __name__ == '__main__':
+    from Point import Point
+    index = GeofenceIndex()
+    index.addFence([Point(10.0, 170.0), Point(10.0, -170.0), Point(20.0, -170.0), Point(20.0, 170.0)])
+    index.addFence(Geometry().convexHull([Point(0.0, 0.0), Point(5.0, 5.0), Point(0.0, 10.0), Point(2.0, 5.0)]))
+    print(index.contains([15.0, 15.0, 2.0, 6.0], [179.5, 160.0, 5.0, 5.0]))
+    print(index.hits([15.0, 15.0, 2.0, 6.0], [179.5, 160.0, 5.0, 5.0]))
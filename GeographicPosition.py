@@ -11,6 +11,7 @@
  ***************************************************************************** 
 '''
 class GeographicPosition():
+    __slots__ = ('latitude', 'longitude')
     
     def __init__(self, *args):
         if(len(args) > 0):
@@ -45,4 +46,13 @@ class GeographicPosition():
         if isinstance(other, GeographicPosition):
             res = ((self.latitude == other.latitude) and (self.longitude == other.longitude)) or (self.latitude == 90.0 and other.latitude == 90.0) or (self.latitude == -90.0 and other.latitude == -90.0)
             return res
-        return NotImplemented
\ No newline at end of file
+        return NotImplemented
+
+    def __hash__(self):
+        """
+            Consistent with __eq__: positions at the same pole hash alike whatever their
+            longitude.  A position used as a dict key or set member must not be changed.
+        """
+        if self.latitude == 90.0 or self.latitude == -90.0:
+            return hash(self.latitude)
+        return hash((self.latitude, self.longitude))
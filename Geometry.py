@@ -13,6 +13,7 @@
 from Stack import Stack
 from Point import Point
 from NavCommon import NavCommon
+from NavException import LatitudeLimitError
 import math
 import Orientation
 
@@ -112,9 +113,9 @@ class Geometry(NavCommon):
     def angleSort(self, thePoints):
         """ 
             Sort by increasing angle using the orientation method avoiding computation of
-            angles.
+            angles.  A list is sorted in place; a Track is first copied to a list of its fixes.
         """
-        alist = thePoints
+        alist = thePoints if isinstance(thePoints, list) else list(thePoints)
         #print(self.showPoints(alist)) # DEBUG
         ix0 = self.selectFirstPoint(alist);
         p0  = alist[ix0]    # Select westmost point
@@ -140,6 +141,84 @@ class Geometry(NavCommon):
         alist.insert(0, p0)
         return alist;
    
+    def unwrapLongitudes(self, theLongitudes):
+        """
+            Return the longitudes shifted by multiples of 360 so that they form one
+            contiguous range, cut at the largest empty gap around the globe.  Sets that
+            cross the antimeridian then come out continuous (e.g. 179 and 181).
+        """
+        import numpy as np
+        lon = np.mod(np.asarray(theLongitudes, dtype=np.float64) + 180.0, 360.0) - 180.0
+        if len(lon) < 2:
+            return lon
+        ordered = np.sort(lon)
+        gaps = np.diff(np.concatenate((ordered, [ordered[0] + 360.0])))
+        widest = int(np.argmax(gaps))
+        if widest == len(ordered) - 1:
+            return lon      # The widest gap already spans the antimeridian
+        west = ordered[widest + 1]
+        return np.where(lon < west, lon + 360.0, lon)
+
+    def convexHullIndices(self, theLatitudes, theLongitudes, keepCollinear = False):
+        """
+            Andrew's monotone chain convex hull in O(n log n) over arrays of latitudes and
+            longitudes, treating longitude as x and latitude as y like isLeft.
+            Returns the indices of the hull vertices in counter-clockwise order, starting
+            with the westernmost (then southernmost) point, as selectFirstPoint does.
+            Points lying on a hull edge are dropped unless keepCollinear is set; duplicates
+            appear once.  Sets crossing the antimeridian are unwrapped first.
+        """
+        import numpy as np
+        lat = np.asarray(theLatitudes, dtype=np.float64)
+        lon = self.unwrapLongitudes(theLongitudes)
+        order = np.lexsort((lat, lon))
+        xs = lon[order].tolist()
+        ys = lat[order].tolist()
+        ix = order.tolist()
+
+        # Drop repeated points
+        unique = [0] if ix else []
+        for k in range(1, len(ix)):
+            if xs[k] != xs[unique[-1]] or ys[k] != ys[unique[-1]]:
+                unique.append(k)
+        if len(unique) < 3:
+            return np.array([ix[k] for k in unique], dtype=np.int64)
+
+        def chain(ks):
+            hull = []
+            for k in ks:
+                while len(hull) >= 2:
+                    o = hull[-2]
+                    a = hull[-1]
+                    cross = (xs[a] - xs[o]) * (ys[k] - ys[o]) - (ys[a] - ys[o]) * (xs[k] - xs[o])
+                    if cross > 0.0 or (keepCollinear and cross == 0.0):
+                        break
+                    hull.pop()
+                hull.append(k)
+            return hull
+
+        lower = chain(unique)
+        upper = chain(reversed(unique))
+        if keepCollinear and len(lower) == len(unique):
+            hull = lower        # All the points are collinear
+        else:
+            hull = lower[:-1] + upper[:-1]
+        return np.array([ix[k] for k in hull], dtype=np.int64)
+
+    def convexHull(self, thePoints, keepCollinear = False):
+        """
+            O(n log n) convex hull of a list of Points (or a Track).  Returns the hull
+            vertices in counter-clockwise order starting at the westernmost point.
+            A list gives back its own Point objects; a Track gives new Points.
+        """
+        import numpy as np
+        if hasattr(thePoints, 'latitudes'):
+            hull = self.convexHullIndices(thePoints.latitudes(), thePoints.longitudes(), keepCollinear)
+            return [thePoints[int(i)].toPoint() for i in hull]
+        lats = np.fromiter((p.getLatitude() for p in thePoints), dtype=np.float64, count=len(thePoints))
+        lons = np.fromiter((p.getLongitude() for p in thePoints), dtype=np.float64, count=len(thePoints))
+        return [thePoints[i] for i in self.convexHullIndices(lats, lons, keepCollinear).tolist()]
+    
     def calculateHeading(self, aStartPosition, anEndPosition):
         lat_error = 0.00005
         long_error = 0.000005
@@ -154,7 +233,7 @@ class Geometry(NavCommon):
         
         # check if tracks are above 85 degrees latitude
         if (abs(source_lat) > self.RAD_85 or abs(target_lat) > self.RAD_85):
-            raise Exception("Track above or below 85 degrees latitude.")
+            raise LatitudeLimitError("Track above or below 85 degrees latitude.")
         else:
             # calc change in latitude and longitude
             del_lat = target_lat - source_lat;
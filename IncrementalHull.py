@@ -0,0 +1,128 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Keep the convex hull of a stream of positions up to date
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      The hull is held as its lower and upper monotone chains (the two
+ *      halves built by Geometry.convexHullIndices), each sorted by
+ *      (longitude, latitude).  A new position is located in each chain by
+ *      bisection; one cross product against the chain edge above or below
+ *      it tells whether it lies inside, in which case it is dropped without
+ *      further work.  Otherwise it is inserted and the neighbours it makes
+ *      concave are removed from either side.  Every position is removed at
+ *      most once, so the updates are amortized O(log h) searches plus the
+ *      list insertion.
+ *      Longitudes are unwrapped relative to the first position, so an area
+ *      may straddle the antimeridian but must span less than 180 degrees.
+ *****************************************************************************
+'''
+from bisect import bisect_left
+from NavCommon import NavCommon
+from Point import Point
+
+class IncrementalHull(NavCommon):
+
+    def __init__(self, thePoints = None):
+        self.reference = None
+        self.lower = []         # (lon, lat) keys of the lower chain, west to east
+        self.lowerPoints = []
+        self.upper = []         # (lon, lat) keys of the upper chain, west to east
+        self.upperPoints = []
+        if thePoints is not None:
+            self.extend(thePoints)
+
+    def unwrap(self, theLongitude):
+        """ Shift a longitude to within 180 degrees of the first position's. """
+        if self.reference is None:
+            self.reference = theLongitude
+        return self.reference + (theLongitude - self.reference + 180.0) % 360.0 - 180.0
+
+    def insert(self, keys, points, key, thePoint, sign):
+        """
+            Insert into one chain; sign is 1 for the lower chain (left turns) and -1 for
+            the upper chain (right turns).  Returns False if the point is not on the chain.
+        """
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return False
+        if 0 < i < len(keys):
+            o = keys[i - 1]
+            b = keys[i]
+            cross = (key[0] - o[0]) * (b[1] - o[1]) - (key[1] - o[1]) * (b[0] - o[0])
+            if sign * cross <= 0.0:
+                return False
+        keys.insert(i, key)
+        points.insert(i, thePoint)
+
+        # Remove the neighbours to the west, then to the east, that are no longer convex
+        while i >= 2:
+            o = keys[i - 2]
+            a = keys[i - 1]
+            if sign * ((a[0] - o[0]) * (key[1] - o[1]) - (a[1] - o[1]) * (key[0] - o[0])) > 0.0:
+                break
+            del keys[i - 1]
+            del points[i - 1]
+            i -= 1
+        while i + 2 < len(keys):
+            a = keys[i + 1]
+            b = keys[i + 2]
+            if sign * ((a[0] - key[0]) * (b[1] - key[1]) - (a[1] - key[1]) * (b[0] - key[0])) > 0.0:
+                break
+            del keys[i + 1]
+            del points[i + 1]
+        return True
+
+    def add(self, *args):
+        """
+            add(point) or add(lat, lon).  Returns True if the hull changed, False if the
+            position was inside (or on) the current hull.
+        """
+        if len(args) == 2:
+            thePoint = Point(args[0], args[1])
+        else:
+            thePoint = args[0]
+        key = (self.unwrap(thePoint.getLongitude()), thePoint.getLatitude())
+        changed = self.insert(self.lower, self.lowerPoints, key, thePoint, 1.0)
+        changed = self.insert(self.upper, self.upperPoints, key, thePoint, -1.0) or changed
+        return changed
+
+    def extend(self, thePoints):
+        """ Add a list of Points (or a Track); returns how many of them changed the hull. """
+        if hasattr(thePoints, 'latitudes'):
+            thePoints = thePoints.toPoints()
+        count = 0
+        for p in thePoints:
+            if self.add(p):
+                count += 1
+        return count
+
+    def getHull(self):
+        """
+            The hull vertices as a list of Points in counter-clockwise order, starting at
+            the westernmost (then southernmost) point, as Geometry.convexHull returns them.
+        """
+        if len(self.lowerPoints) < 2:
+            return list(self.lowerPoints)
+        return self.lowerPoints[:-1] + self.upperPoints[:0:-1]
+
+    def __len__(self):
+        return max(0, len(self.lower) + len(self.upper) - 2) if len(self.lower) > 1 else len(self.lower)
+
+
+if __name__ == '__main__':
+    import random
+    from Geometry import Geometry
+    random.seed(1)
+    hull = IncrementalHull()
+    fixes = []
+    for i in range(2000):
+        fix = Point(random.uniform(-5.0, 5.0), 179.0 + random.uniform(-3.0, 3.0))
+        fixes.append(fix)
+        hull.add(fix)
+    print("Incremental: " + Geometry().showPoints(hull.getHull()))
+    print("Batch:       " + Geometry().showPoints(Geometry().convexHull(fixes)))
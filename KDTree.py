@@ -0,0 +1,146 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     A k-d tree over points in k dimensions (usually 3-D unit vectors)
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Nodes split the widest side of their bounding box at the median and
+ *      are stored in flat lists; leaves hold contiguous slices of the
+ *      permuted points so that distances can be computed a block at a time.
+ *      Closest pair searches walk two trees together (dual tree), pruning
+ *      node pairs whose bounding boxes are further apart than the best
+ *      distance found so far.
+ *      Points may be given radii, making them balls; the node boxes then
+ *      enclose the balls, so box distances stay lower bounds for any
+ *      object the balls contain (e.g. the legs of a Route).
+ *****************************************************************************
+'''
+import numpy as np
+
+class KDTree(object):
+
+    def __init__(self, thePoints, leafSize = 32, theRadii = None):
+        points = np.asarray(thePoints, dtype=np.float64)
+        if points.ndim != 2:
+            raise ValueError("Points must be an N x k array")
+        self.radii = None if theRadii is None else np.asarray(theRadii, dtype=np.float64)
+        self.leafSize = max(1, int(leafSize))
+        self.indices = np.arange(len(points))
+        self.lo = []
+        self.hi = []
+        self.start = []
+        self.stop = []
+        self.left = []
+        self.right = []
+        if len(points) > 0:
+            self.build(points, 0, len(points))
+        self.data = points[self.indices]
+
+    def build(self, points, start, stop):
+        """ Build the node holding indices[start:stop]; returns the node number. """
+        node = len(self.start)
+        subset = points[self.indices[start:stop]]
+        if self.radii is None:
+            self.lo.append(subset.min(axis=0))
+            self.hi.append(subset.max(axis=0))
+        else:
+            radii = self.radii[self.indices[start:stop], None]
+            self.lo.append((subset - radii).min(axis=0))
+            self.hi.append((subset + radii).max(axis=0))
+        self.start.append(start)
+        self.stop.append(stop)
+        self.left.append(-1)
+        self.right.append(-1)
+        if stop - start > self.leafSize:
+            axis = int(np.argmax(self.hi[node] - self.lo[node]))
+            middle = (stop - start) // 2
+            part = np.argpartition(subset[:, axis], middle)
+            self.indices[start:stop] = self.indices[start:stop][part]
+            self.left[node] = self.build(points, start, start + middle)
+            self.right[node] = self.build(points, start + middle, stop)
+        return node
+
+    def size(self):
+        return len(self.indices)
+
+    def isLeaf(self, node):
+        return self.left[node] < 0
+
+    def boxDistance(self, node, other, otherNode):
+        """ Smallest possible distance between a point of this node and one of the other node. """
+        gap = np.maximum(0.0, np.maximum(other.lo[otherNode] - self.hi[node], self.lo[node] - other.hi[otherNode]))
+        return float(np.sqrt(np.dot(gap, gap)))
+
+    def dualTraverse(self, other, bound, visitLeaves):
+        """
+            Walk the node pairs of both trees that may hold points within
+            bound(node, otherNode).  Leaf pairs are handed to visitLeaves(node, otherNode),
+            which may shrink the bound.
+        """
+        if self.size() == 0 or other.size() == 0:
+            return
+        stack = [(self.boxDistance(0, other, 0), 0, 0)]
+        while stack:
+            dist, node, otherNode = stack.pop()
+            if dist > bound(node, otherNode):
+                continue
+            if self.isLeaf(node) and other.isLeaf(otherNode):
+                visitLeaves(node, otherNode)
+                continue
+            split_self = other.isLeaf(otherNode) or \
+                (not self.isLeaf(node) and self.stop[node] - self.start[node] >= other.stop[otherNode] - other.start[otherNode])
+            if split_self:
+                pairs = [(c, otherNode) for c in (self.left[node], self.right[node])]
+            else:
+                pairs = [(node, c) for c in (other.left[otherNode], other.right[otherNode])]
+            pairs = [(self.boxDistance(a, other, b), a, b) for a, b in pairs]
+            # Push the farther pair first so that the nearer one is explored first
+            pairs.sort(reverse=True)
+            stack.extend(pairs)
+
+    def leafDistances(self, node, other, otherNode):
+        a = self.data[self.start[node]:self.stop[node]]
+        b = other.data[other.start[otherNode]:other.stop[otherNode]]
+        diff = a[:, None, :] - b[None, :, :]
+        return np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+
+    def closestDistance(self, other):
+        """ Return the smallest distance between a point of this tree and a point of the other. """
+        best = [np.inf]
+
+        def visit(node, otherNode):
+            best[0] = min(best[0], float(self.leafDistances(node, other, otherNode).min()))
+
+        self.dualTraverse(other, lambda node, otherNode: best[0], visit)
+        return best[0]
+
+    def pairsWithin(self, other, theDistance):
+        """
+            Return [thisIx, otherIx], the original indices of every pair of points, one
+            from each tree, no further apart than theDistance.
+        """
+        this_ix = []
+        other_ix = []
+
+        def visit(node, otherNode):
+            i, j = np.nonzero(self.leafDistances(node, other, otherNode) <= theDistance)
+            if len(i) > 0:
+                this_ix.append(self.indices[self.start[node] + i])
+                other_ix.append(other.indices[other.start[otherNode] + j])
+
+        self.dualTraverse(other, lambda node, otherNode: theDistance, visit)
+        if len(this_ix) == 0:
+            return [np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)]
+        return [np.concatenate(this_ix), np.concatenate(other_ix)]
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    a = KDTree(rng.random((1000, 3)))
+    b = KDTree(rng.random((1000, 3)))
+    best = a.closestDistance(b)
+    print("Closest distance: " + str(best) + "  pairs: " + str(a.pairsWithin(b, best)))
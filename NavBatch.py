@@ -0,0 +1,630 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Batch (array) versions of the Navigational Utilities
+ *        Great Circle Computations over many positions at once
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Each method mirrors the scalar method of the same name in NavUtils,
+ *      branch for branch, but operates element-wise on NumPy arrays.
+ *      Positions may be given as separate latitude and longitude arrays,
+ *      as an N x 2 array of [latitude, longitude] rows or as a Track.
+ *      Arrays are broadcast against each other in the usual NumPy way.
+ *      Range, bearing and dead reckoning take the same AccuracyMode as
+ *      NavUtils: per call (mode=), per instance or for every NavBatch.
+ *****************************************************************************
+'''
+import numpy as np
+from NavCommon import NavCommon
+from NavUtils import BearingType
+from NavUtils import AccuracyMode
+from NavUtils import EXACT_MODE
+from CPA_Data import CPA_State
+from NavException import AntipodalError
+
+# One Closest Point of Approach result per pair; code holds the CPA_State value
+CPA_DTYPE = np.dtype([('rangeAtCPA', np.float64), ('elapsedTime', np.float64), ('distToCPA', np.float64),
+                      ('latitude', np.float64), ('longitude', np.float64), ('code', np.int8)])
+
+class NavBatch(NavCommon):
+    # Unit vector dot product at or below which two positions are taken as antipodal
+    ANTIPODAL_DOT = -1.0 + 1.0e-12
+    # Legs of a route whose distances from a position differ by no more than this (radians,
+    # the acos rounding floor) are taken as equally near, and the lowest leg index is used
+    LEG_TIE_ANGLE = 4.0 * np.sqrt(np.finfo(np.float64).eps)
+    accuracyMode = EXACT_MODE
+
+    def positionArrays(self, *args):
+        """
+            Convert positions to a pair of float64 arrays [latitudes, longitudes].
+            Accepts a Track, an N x 2 array of [lat, lon] rows or separate latitude
+            and longitude arrays.
+        """
+        if len(args) == 1 and hasattr(args[0], 'latitudes'):
+            return [args[0].latitudes(), args[0].longitudes()]
+        if len(args) == 1:
+            pos = np.asarray(args[0], dtype=np.float64)
+            if pos.shape[-1] != 2:
+                raise ValueError("Position array must have a last dimension of 2 [lat, lon]")
+            return [pos[..., 0], pos[..., 1]]
+        return [np.asarray(args[0], dtype=np.float64), np.asarray(args[1], dtype=np.float64)]
+
+    def GreatCircleRange(self, *args, mode = None):
+        """
+            Given arrays of starting and ending geographic positions, computes the distances
+            (in degrees) between the pairs of points.  Distances may be converted to NM by
+            multiplying by 60.0
+
+            GreatCircleRange(starts, ends)                       N x 2 arrays of [lat, lon]
+            GreatCircleRange(startLat, startLon, endLat, endLon) arrays of degrees
+        """
+        if len(args) == 2:
+            start_lat, start_lon = self.positionArrays(args[0])
+            end_lat, end_lon = self.positionArrays(args[1])
+        else:
+            start_lat, start_lon = self.positionArrays(args[0], args[1])
+            end_lat, end_lon = self.positionArrays(args[2], args[3])
+
+        if mode is None:
+            mode = self.accuracyMode
+        if mode is not EXACT_MODE:
+            return self.approximateRange(start_lat, start_lon, end_lat, end_lon, mode)
+
+        source_lat = self.PI_OVER_180 * start_lat
+        source_long = self.PI_OVER_180 * start_lon
+        tgt_lat = self.PI_OVER_180 * end_lat
+        tgt_long = self.PI_OVER_180 * end_lon
+
+        #  compute delta lat and delta long
+        delta_lat = source_lat - tgt_lat
+        delta_long = source_long - tgt_long
+
+        #  normalize longitude
+        delta_long = np.where(delta_long > self.RAD_180, delta_long - self.RAD_360,
+                              np.where(delta_long < -self.RAD_180, delta_long + self.RAD_360, delta_long))
+
+        #  compute great circle distance
+        cos_source = np.cos(source_lat)
+        cos_tgt = np.cos(tgt_lat)
+        arange = np.cos(delta_lat) - (1.0 - np.cos(delta_long)) * cos_source * cos_tgt
+
+        arange = np.where(np.abs(arange) >= 1.0, 0.0, np.abs(np.arccos(np.clip(arange, -1.0, 1.0))))
+
+        #  where the distance is under five miles use a linear approximation
+        with np.errstate(invalid='ignore'):
+            linear = np.sqrt(delta_lat * delta_lat + delta_long * delta_long * cos_source * cos_tgt)
+        arange = np.where(arange < self.RAD_FIVE_MILES, linear, arange)
+
+        return arange * self.RAD_TO_DEGREE
+
+    def GreatCircle(self, aLatitude, aLongitude, aCourse, aDistance, mode = None):
+        """
+            Advance arrays of tracks along their great circles by the given distances (NM).
+            Returns [latitudes, longitudes, courses] in degrees.
+
+            The new positions follow NavUtils.GreatCircle exactly, including the vertex
+            check, the polar crossing adjustment and the longitude normalization.  The
+            returned course is the great circle course at the new position in [0, 360).
+        """
+        if mode is None:
+            mode = self.accuracyMode
+        if mode is not EXACT_MODE:
+            return self.approximatePosition(aLatitude, aLongitude, aCourse, aDistance, mode)
+        eff_rad_0 = 0.000005
+        course = self.PI_OVER_180 * np.asarray(aCourse, dtype=np.float64)
+        latitude = self.PI_OVER_180 * np.asarray(aLatitude, dtype=np.float64)
+        longitude = self.PI_OVER_180 * np.asarray(aLongitude, dtype=np.float64)
+        distance = self.PI_OVER_180 * (np.asarray(aDistance, dtype=np.float64) / self.NM_PER_DEGREE)
+
+        sin_crs = np.sin(course)
+        cos_crs = np.cos(course)
+
+        sin_lat = np.sin(latitude)
+        cos_lat = np.cos(latitude)
+
+        cos_dist = np.cos(distance)
+        sin_dist = np.sin(distance)
+
+        new_lat = np.arcsin(np.clip(cos_dist * sin_lat + cos_crs * sin_dist * cos_lat, -1.0, 1.0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta_long = np.arctan(sin_dist * sin_crs / (cos_dist * cos_lat - sin_dist * cos_crs * sin_lat))
+
+            # Perform course update
+            sin_new_crs = sin_crs * cos_lat / np.cos(new_lat)
+        sin_new_crs = np.where(np.abs(sin_new_crs) > 1.0, 1.0, sin_new_crs)
+
+        cos_new_crs = np.sqrt(1.0 - sin_new_crs * sin_new_crs)
+
+        # Vertex of great circle check
+        cos_new_crs = np.where((np.sin(new_lat) * cos_dist - sin_lat) < 0.0, -cos_new_crs, cos_new_crs)
+
+        unsigned_crs = np.arccos(cos_new_crs)
+        new_crs = np.where(course < 0.0, -unsigned_crs, unsigned_crs)
+
+        # Check for polar crossing
+        meridian = (np.abs(course) < eff_rad_0) | (np.abs(course - self.RAD_180) < eff_rad_0)
+        crossing = meridian & (np.abs(new_crs - course) > self.RAD_90)
+        adjustment = np.where(longitude < 0.0, self.RAD_180, -self.RAD_180)
+        new_long = np.where(crossing, longitude + adjustment, longitude)
+
+        # Normalize longitude
+        new_long = new_long + delta_long
+        new_long = np.where(np.abs(new_long) >= self.RAD_180, new_long - self.RAD_360 * np.sign(new_long), new_long)
+
+        # Course at the new position, keeping the east/west sense of the original course
+        new_course = self.toDegrees(unsigned_crs)
+        new_course = np.where(sin_crs < 0.0, 360.0 - new_course, new_course) % 360.0
+
+        return [self.toDegrees(new_lat), self.toDegrees(new_long), new_course]
+
+    def CalculatePositionCS(self, *args, mode = None):
+        """
+            Computes new geographic positions based on headings, speeds, and a time interval
+            (in hours) from the starting locations.  Returns [latitudes, longitudes, courses].
+            Tracks with no speed keep their position and course.
+
+            CalculatePositionCS(positions, speeds, headings, timeInterval)
+            CalculatePositionCS(lats, lons, speeds, headings, timeInterval)
+        """
+        if len(args) == 4:
+            l_lat, l_long = self.positionArrays(args[0])
+            theSpeed, theHeading, theTimeInterval = args[1:]
+        else:
+            l_lat, l_long = self.positionArrays(args[0], args[1])
+            theSpeed, theHeading, theTimeInterval = args[2:]
+        speed = np.asarray(theSpeed, dtype=np.float64)
+        heading = np.asarray(theHeading, dtype=np.float64)
+
+        l_distance = speed * theTimeInterval
+        new_lat, new_long, new_course = self.GreatCircle(l_lat, l_long, heading, l_distance, mode)
+
+        moving = speed > 0.0
+        new_lat = np.where(moving, new_lat, l_lat)
+        new_long = np.where(moving, new_long, l_long)
+        new_course = np.where(moving, new_course, heading)
+        return [new_lat, new_long, new_course]
+
+    def CalculateBearing(self, theHeading, *args, mode = None):
+        """
+            Calculate the bearings from arrays of geographic positions to others given the
+            headings at the starts.  Returns [bearings, invalid] where invalid marks the rows
+            with a track above or below 85 degrees latitude; their bearings are NaN.
+
+            CalculateBearing(headings, starts, ends, bearingType)
+            CalculateBearing(headings, startLat, startLon, endLat, endLon, bearingType)
+        """
+        lat_error = 0.00005
+        long_error = 0.000005
+
+        theBearingType = args[-1]
+        if len(args) == 3:
+            start_lat, start_lon = self.positionArrays(args[0])
+            end_lat, end_lon = self.positionArrays(args[1])
+        else:
+            start_lat, start_lon = self.positionArrays(args[0], args[1])
+            end_lat, end_lon = self.positionArrays(args[2], args[3])
+
+        if mode is None:
+            mode = self.accuracyMode
+        if mode is not EXACT_MODE:
+            return self.approximateBearing(theHeading, start_lat, start_lon, end_lat, end_lon, theBearingType, mode)
+
+        source_lat = self.PI_OVER_180 * start_lat
+        source_long = self.PI_OVER_180 * start_lon
+        target_lat = self.PI_OVER_180 * end_lat
+        target_long = self.PI_OVER_180 * end_lon
+        source_heading = self.PI_OVER_180 * np.asarray(theHeading, dtype=np.float64)
+
+        #  flag tracks above 85 degrees latitude
+        invalid = (np.abs(source_lat) > self.RAD_85) | (np.abs(target_lat) > self.RAD_85)
+
+        #  calc change in latitude and longitude
+        del_lat = target_lat - source_lat
+        del_long = target_long - source_long
+
+        #  normalize
+        del_long = np.where(del_long > self.RAD_180, del_long - self.RAD_360,
+                            np.where(del_long < -self.RAD_180, del_long + self.RAD_360, del_long))
+
+        #  calculate the angle in radians
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_term = np.tan(self.RAD_45 + target_lat / 2.0) / np.tan(self.RAD_45 + source_lat / 2.0)
+            ln_term = np.log(t_term)
+            abs_bearing = np.arctan(del_long / ln_term)
+
+        # check for headings of +/- pi_over_2 and of 0/pi
+        east_west = np.abs(del_lat) < lat_error
+        north_south = ~east_west & (np.abs(del_long) < long_error)
+        mercator = ~(east_west | north_south)
+        abs_bearing = np.where(east_west, np.where(del_long >= 0, self.RAD_90, -self.RAD_90), abs_bearing)
+        abs_bearing = np.where(north_south, np.where(target_lat >= source_lat, 0.0, self.RAD_180), abs_bearing)
+
+        #  convert to the proper quadrant
+        ln_term = np.where(mercator, ln_term, 0.0)
+        quadrant = np.where(del_long > 0.0, self.RAD_180, -self.RAD_180)
+        abs_bearing = np.where(ln_term < 0.0, abs_bearing + quadrant, abs_bearing)
+
+        if theBearingType == BearingType.RELATIVE:
+            #  calculate relative bearing
+            rel_bearing = abs_bearing - source_heading
+
+            #  normalize
+            rel_bearing = np.where(rel_bearing > self.RAD_180, rel_bearing - self.RAD_360,
+                                   np.where(rel_bearing < -self.RAD_180, rel_bearing + self.RAD_360, rel_bearing))
+            bearing = self.toDegrees(rel_bearing)
+        else:
+            bearing = self.toDegrees(abs_bearing)
+
+        bearing = np.where(invalid, np.nan, bearing)
+        return [bearing, invalid]
+
+    def CalculateAbsBearing(self, *args, mode = None):
+        """
+            Calculate Absolute bearings irregardless of heading.  Returns [bearings, invalid].
+
+            CalculateAbsBearing(starts, ends)
+            CalculateAbsBearing(startLat, startLon, endLat, endLon)
+        """
+        return self.CalculateBearing(0.0, *args, BearingType.ABSOLUTE, mode=mode)
+
+    def approximateOffsets(self, startLat, startLon, endLat, endLon, mode):
+        """
+            Return [east, north, beyond]: the offsets (radians of arc) of the end positions from
+            the starts on the plane of an approximate AccuracyMode, and the rows with a position
+            beyond the latitude tolerance, which the approximations do not cover.
+        """
+        source_lat = self.PI_OVER_180 * startLat
+        target_lat = self.PI_OVER_180 * endLat
+        delta_long = self.PI_OVER_180 * (endLon - startLon)
+        delta_long = np.where(delta_long > self.RAD_180, delta_long - self.RAD_360,
+                              np.where(delta_long < -self.RAD_180, delta_long + self.RAD_360, delta_long))
+        if mode == AccuracyMode.FLAT_EARTH:
+            scale = np.cos(source_lat)
+        else:
+            scale = np.cos(0.5 * (source_lat + target_lat))
+        beyond = (np.abs(source_lat) > self.LAT_TOLERANCE) | (np.abs(target_lat) > self.LAT_TOLERANCE)
+        return list(np.broadcast_arrays(delta_long * scale, target_lat - source_lat, beyond))
+
+    def approximateRange(self, startLat, startLon, endLat, endLon, mode):
+        """ GreatCircleRange (degrees) on the plane of an approximate AccuracyMode. """
+        east, north, beyond = self.approximateOffsets(startLat, startLon, endLat, endLon, mode)
+        arange = np.asarray(np.sqrt(east * east + north * north) * self.RAD_TO_DEGREE)
+        if np.any(beyond):
+            rows = np.broadcast_arrays(startLat, startLon, endLat, endLon)
+            arange[beyond] = self.GreatCircleRange(*[a[beyond] for a in rows], mode=EXACT_MODE)
+        return arange
+
+    def approximateBearing(self, theHeading, startLat, startLon, endLat, endLon, theBearingType, mode):
+        """ CalculateBearing on the plane of an approximate AccuracyMode.  Returns [bearings, invalid]. """
+        east, north, invalid = self.approximateOffsets(startLat, startLon, endLat, endLon, mode)
+        bearing = np.arctan2(east, north)
+        if theBearingType == BearingType.RELATIVE:
+            bearing = bearing - self.PI_OVER_180 * np.asarray(theHeading, dtype=np.float64)
+            bearing = np.where(bearing > self.RAD_180, bearing - self.RAD_360,
+                               np.where(bearing < -self.RAD_180, bearing + self.RAD_360, bearing))
+        bearing = np.where(invalid, np.nan, self.toDegrees(bearing))
+        return [bearing, invalid]
+
+    def approximatePosition(self, aLatitude, aLongitude, aCourse, aDistance, mode):
+        """
+            GreatCircle on the plane of an approximate AccuracyMode, holding the course.  Rows
+            beyond the latitude tolerance use the great circle equations.
+        """
+        latitude, longitude, course, distance = np.broadcast_arrays(
+            *[np.asarray(a, dtype=np.float64) for a in (aLatitude, aLongitude, aCourse, aDistance)])
+        course_rad = self.PI_OVER_180 * course
+        arc = self.PI_OVER_180 * (distance / self.NM_PER_DEGREE)
+        start_lat = self.PI_OVER_180 * latitude
+        delta_lat = arc * np.cos(course_rad)
+        new_lat = start_lat + delta_lat
+        if mode == AccuracyMode.FLAT_EARTH:
+            scale = np.cos(start_lat)
+        else:
+            scale = np.cos(start_lat + 0.5 * delta_lat)
+        beyond = (np.abs(start_lat) > self.LAT_TOLERANCE) | (np.abs(new_lat) > self.LAT_TOLERANCE)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            new_long = self.PI_OVER_180 * longitude + arc * np.sin(course_rad) / scale
+        new_long = np.where(np.abs(new_long) >= self.RAD_180, new_long - self.RAD_360 * np.sign(new_long), new_long)
+
+        new_lat = np.asarray(self.toDegrees(new_lat))
+        new_long = np.asarray(self.toDegrees(new_long))
+        new_course = np.asarray(course % 360.0)
+        if np.any(beyond):
+            exact = self.GreatCircle(latitude[beyond], longitude[beyond], course[beyond], distance[beyond], EXACT_MODE)
+            new_lat[beyond], new_long[beyond], new_course[beyond] = exact
+        return [new_lat, new_long, new_course]
+
+    def unitVectorArrays(self, theLatitudes, theLongitudes):
+        """ Return [x, y, z], the unit vector components of arrays of positions (degrees). """
+        lat = self.PI_OVER_180 * theLatitudes
+        lon = self.PI_OVER_180 * theLongitudes
+        cos_lat = np.cos(lat)
+        return [cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)]
+
+    def NewPositionFraction(self, *args):
+        """
+            Find the points at the given fractions of the great circle paths between arrays
+            of start and end positions.  Returns [latitudes, longitudes].  The arrays broadcast,
+            so one leg with an array of K fractions gives K points.  Zero-length legs give the
+            start position; antipodal legs raise AntipodalError.
+
+            NewPositionFraction(starts, ends, fractions)
+            NewPositionFraction(startLat, startLon, endLat, endLon, fractions)
+        """
+        if len(args) == 3:
+            start_lat, start_lon = self.positionArrays(args[0])
+            end_lat, end_lon = self.positionArrays(args[1])
+        else:
+            start_lat, start_lon = self.positionArrays(args[0], args[1])
+            end_lat, end_lon = self.positionArrays(args[2], args[3])
+        fraction = np.asarray(args[-1], dtype=np.float64)
+
+        # Cartesian terms of both ends, computed once per leg
+        x1, y1, z1 = self.unitVectorArrays(start_lat, start_lon)
+        x2, y2, z2 = self.unitVectorArrays(end_lat, end_lon)
+        if np.any(x1 * x2 + y1 * y2 + z1 * z2 <= self.ANTIPODAL_DOT):
+            raise AntipodalError("Great circle leg between antipodal positions is undefined.")
+
+        distance = self.PI_OVER_180 * self.GreatCircleRange(start_lat, start_lon, end_lat, end_lon)
+        zero = distance == 0.0
+        sin_dist = np.where(zero, 1.0, np.sin(distance))
+        a = np.where(zero, 1.0, np.sin(distance * (1.0 - fraction)) / sin_dist)
+        b = np.where(zero, 0.0, np.sin(distance * fraction) / sin_dist)
+        x = a * x1 + b * x2
+        y = a * y1 + b * y2
+        z = a * z1 + b * z2
+        lat_f = self.toDegrees(np.arctan2(z, np.sqrt(x * x + y * y)))
+        lon_f = self.toDegrees(np.arctan2(y, x))
+        return [lat_f, lon_f]
+
+    def routeLegs(self, theRoute, spacing, count):
+        """
+            Return [latitudes, longitudes, legStart], the waypoints and the index of the first
+            densified point of each leg, for a route divided into count segments per leg or
+            into segments no longer than spacing (NM).  Raises ValueError unless spacing is
+            positive and finite or count is at least 1.
+        """
+        lat, lon = self.positionArrays(theRoute)
+        lat = np.ravel(lat)
+        lon = np.ravel(lon)
+        if len(lat) < 2:
+            raise ValueError("A route needs at least two waypoints")
+        if (spacing is None) == (count is None):
+            raise ValueError("Give exactly one of spacing and count")
+        if count is not None:
+            if not count >= 1:
+                raise ValueError("count must be at least 1")
+            segments = np.full(len(lat) - 1, int(count), dtype=np.int64)
+        else:
+            if not (np.isfinite(spacing) and spacing > 0.0):
+                raise ValueError("spacing must be a positive, finite distance")
+            leg_nm = self.GreatCircleRange(lat[:-1], lon[:-1], lat[1:], lon[1:]) * self.NM_PER_DEGREE
+            segments = np.maximum(1, np.ceil(leg_nm / float(spacing))).astype(np.int64)
+        return [lat, lon, np.concatenate(([0], np.cumsum(segments)))]
+
+    def routePoints(self, theLatitudes, theLongitudes, theLegStart, first, stop):
+        """ Densified points first to stop (exclusive) of a route split by routeLegs. """
+        points = np.arange(first, stop)
+        leg = np.minimum(np.searchsorted(theLegStart, points, side='right') - 1, len(theLatitudes) - 2)
+        fraction = (points - theLegStart[leg]) / (theLegStart[leg + 1] - theLegStart[leg])
+        return self.NewPositionFraction(theLatitudes[leg], theLongitudes[leg],
+                                        theLatitudes[leg + 1], theLongitudes[leg + 1], fraction)
+
+    def densifyRoute(self, theRoute, spacing = None, count = None):
+        """
+            Densify a route (a Track or an N x 2 array of [lat, lon] waypoints) along the great
+            circles of its legs.  Each leg is divided into count equal segments, or into the
+            fewest equal segments no longer than spacing (NM).  Returns [latitudes, longitudes]
+            including every waypoint once.
+        """
+        lat, lon, leg_start = self.routeLegs(theRoute, spacing, count)
+        return self.routePoints(lat, lon, leg_start, 0, int(leg_start[-1]) + 1)
+
+    def densifyRouteChunks(self, theRoute, spacing = None, count = None, chunkSize = 1 << 16):
+        """
+            Generator version of densifyRoute: yields [latitudes, longitudes] arrays of at most
+            chunkSize points, in route order, so very long routes never need to be held whole.
+        """
+        lat, lon, leg_start = self.routeLegs(theRoute, spacing, count)
+        total = int(leg_start[-1]) + 1
+        for first in range(0, total, chunkSize):
+            yield self.routePoints(lat, lon, leg_start, first, min(first + chunkSize, total))
+
+    def CrossTrackDistance(self, *args):
+        """
+            Compute the cross-track and along-track distances (NM) of arrays of positions
+            from the great circle legs given by start and end positions.  Returns
+            [crossTrack, alongTrack].  crossTrack is positive when the position is to the right
+            of the direction of travel and negative to the left.  alongTrack is measured from
+            the leg start, to the foot of the perpendicular, and is negative behind the start.
+            A zero-length leg gives the range to its start and an along-track of 0; antipodal
+            legs raise AntipodalError.  The arrays broadcast against each other.
+
+            CrossTrackDistance(positions, starts, ends)
+            CrossTrackDistance(lats, lons, startLat, startLon, endLat, endLon)
+        """
+        if len(args) == 3:
+            lat, lon = self.positionArrays(args[0])
+            start_lat, start_lon = self.positionArrays(args[1])
+            end_lat, end_lon = self.positionArrays(args[2])
+        else:
+            lat, lon = self.positionArrays(args[0], args[1])
+            start_lat, start_lon = self.positionArrays(args[2], args[3])
+            end_lat, end_lon = self.positionArrays(args[4], args[5])
+        px, py, pz = self.unitVectorArrays(lat, lon)
+        ax, ay, az = self.unitVectorArrays(start_lat, start_lon)
+        bx, by, bz = self.unitVectorArrays(end_lat, end_lon)
+        if np.any(ax * bx + ay * by + az * bz <= self.ANTIPODAL_DOT):
+            raise AntipodalError("Great circle leg between antipodal positions is undefined.")
+
+        # Pole of the leg's great circle, n = a x b, and the direction of travel at a, t = n x a
+        nx = ay * bz - az * by
+        ny = az * bx - ax * bz
+        nz = ax * by - ay * bx
+        norm = np.sqrt(nx * nx + ny * ny + nz * nz)
+        zero = norm == 0.0
+        norm = np.where(zero, 1.0, norm)
+        nx = nx / norm
+        ny = ny / norm
+        nz = nz / norm
+        tx = ny * az - nz * ay
+        ty = nz * ax - nx * az
+        tz = nx * ay - ny * ax
+
+        # The pole is to the left of travel, so the sine of the cross-track angle is -p.n
+        sin_xt = np.clip(px * nx + py * ny + pz * nz, -1.0, 1.0)
+        cross_track = -np.arcsin(sin_xt)
+        along_track = np.arctan2(px * tx + py * ty + pz * tz, px * ax + py * ay + pz * az)
+
+        nm = self.NM_PER_DEGREE * self.RAD_TO_DEGREE
+        cross_track = nm * cross_track
+        along_track = nm * along_track
+        if np.any(zero):
+            to_start = self.GreatCircleRange(lat, lon, start_lat, start_lon) * self.NM_PER_DEGREE
+            cross_track = np.where(zero, to_start, cross_track)
+            along_track = np.where(zero, 0.0, along_track)
+        return [cross_track, along_track]
+
+    def routeCrossTrack(self, thePositions, theRoute, blockSize = 1 << 20):
+        """
+            Compute the cross-track and along-track distances (NM) of an array of positions
+            from a polyline route (a Track or an N x 2 array of waypoints).  Each position is
+            measured against the leg whose segment is nearest to it, the lowest leg index
+            when several are equally near (e.g. beyond a shared waypoint).  Returns
+            [crossTrack, alongTrack, leg]: the signed cross-track distance from that leg's
+            great circle, the distance along the route from its first waypoint and the leg
+            index.  Positions are processed blockSize position/leg pairs at a time.
+        """
+        lat, lon = self.positionArrays(thePositions)
+        lat = np.ravel(lat)
+        lon = np.ravel(lon)
+        route_lat, route_lon = self.positionArrays(theRoute)
+        route_lat = np.ravel(route_lat)
+        route_lon = np.ravel(route_lon)
+        if len(route_lat) < 2:
+            raise ValueError("A route needs at least two waypoints")
+        start_lat = route_lat[:-1]
+        start_lon = route_lon[:-1]
+        end_lat = route_lat[1:]
+        end_lon = route_lon[1:]
+        leg_nm = self.GreatCircleRange(start_lat, start_lon, end_lat, end_lon) * self.NM_PER_DEGREE
+        leg_offset = np.concatenate(([0.0], np.cumsum(leg_nm)[:-1]))
+        legs = len(leg_nm)
+
+        cross_track = np.empty(len(lat))
+        along_track = np.empty(len(lat))
+        leg = np.empty(len(lat), dtype=np.int64)
+        rows = max(1, blockSize // legs)
+        for first in range(0, len(lat), rows):
+            plat = lat[first:first + rows, None]
+            plon = lon[first:first + rows, None]
+            xt, at = self.CrossTrackDistance(plat, plon, start_lat, start_lon, end_lat, end_lon)
+
+            # Distance to each leg segment: perpendicular when the foot lies on the leg,
+            # otherwise the range to the nearer end
+            to_start = self.GreatCircleRange(plat, plon, start_lat, start_lon) * self.NM_PER_DEGREE
+            to_end = self.GreatCircleRange(plat, plon, end_lat, end_lon) * self.NM_PER_DEGREE
+            on_leg = (at >= 0.0) & (at <= leg_nm)
+            segment = np.where(on_leg, np.abs(xt), np.minimum(to_start, to_end))
+
+            tie = self.LEG_TIE_ANGLE * self.RAD_TO_DEGREE * self.NM_PER_DEGREE
+            nearest = np.argmax(segment <= segment.min(axis=1)[:, None] + tie, axis=1)
+            block = np.arange(len(nearest))
+            cross_track[first:first + rows] = xt[block, nearest]
+            along_track[first:first + rows] = leg_offset[nearest] + at[block, nearest]
+            leg[first:first + rows] = nearest
+        return [cross_track, along_track, leg]
+
+    def CalculateCPA(self, theApproachPosition, theApproachCourse, theApproachSpeed,
+                           theTargetPosition, theTargetCourse, theTargetSpeed):
+        """
+            Compute the closest points of approach between arrays of approach and target
+            tracks.  Positions are N x 2 arrays of [lat, lon]; courses (degrees) and speeds
+            (knots) are arrays.  All inputs broadcast against each other, so an (N, 1) approach
+            fleet against a (1, M) target fleet gives N x M results.
+
+            Returns a CPA_DTYPE structured array holding, like CPAData, the range at CPA (NM),
+            the elapsed time (seconds), the distance to CPA (NM), the CPA position and the
+            CPA_State code.  Pairs with a track above 85 degrees latitude are CPA_State.INVALID.
+        """
+        epsilon = 0.000001
+
+        approach_lat, approach_lon = self.positionArrays(theApproachPosition)
+        target_lat, target_lon = self.positionArrays(theTargetPosition)
+        approach_heading = np.asarray(theApproachCourse, dtype=np.float64)
+        approach_speed = np.asarray(theApproachSpeed, dtype=np.float64)
+        target_heading = np.asarray(theTargetCourse, dtype=np.float64)
+        target_speed = np.asarray(theTargetSpeed, dtype=np.float64)
+
+        approach_course = self.PI_OVER_2 - self.PI_OVER_180 * approach_heading
+        target_course = self.PI_OVER_2 - self.PI_OVER_180 * target_heading
+
+        approach_speed_x = approach_speed * np.cos(approach_course)
+        approach_speed_y = approach_speed * np.sin(approach_course)
+
+        target_sin = np.sin(target_course)
+        target_cos = np.cos(target_course)
+
+        range_to_target = self.GreatCircleRange(approach_lat, approach_lon, target_lat, target_lon) * self.NM_PER_DEGREE
+        approach_speed_x_rel = approach_speed_x * target_cos + approach_speed_y * target_sin - target_speed
+        approach_speed_y_rel = approach_speed_y * target_cos - approach_speed_x * target_sin
+
+        rel_velocity = np.sqrt(approach_speed_x_rel * approach_speed_x_rel + approach_speed_y_rel * approach_speed_y_rel)
+        still = rel_velocity < epsilon
+
+        # Get approach heading in target's frame of reference
+        x_zero = np.abs(approach_speed_x_rel) <= epsilon
+        y_zero = np.abs(approach_speed_y_rel) <= epsilon
+        with np.errstate(divide='ignore', invalid='ignore'):
+            approach_course_rel = np.arctan(approach_speed_y_rel / approach_speed_x_rel)
+        approach_course_rel = np.where(x_zero, np.where(y_zero, 0.0, self.PI), approach_course_rel)
+
+        # Adjust for quadrant
+        approach_course_rel = np.where(
+            (approach_speed_x_rel < 0.0) | x_zero,
+            np.where((approach_speed_y_rel > 0.0) | y_zero, self.PI + approach_course_rel, approach_course_rel - self.PI),
+            approach_course_rel)
+        approach_course_rel = np.where(still, 0.0, approach_course_rel)
+
+        approach_rb, invalid = self.CalculateBearing(target_heading - self.toDegrees(approach_course_rel),
+                                                     approach_lat, approach_lon, target_lat, target_lon,
+                                                     BearingType.RELATIVE)
+        approach_rb = self.PI_OVER_180 * approach_rb
+
+        code = np.where(still, CPA_State.NO_RELATIVE_MOTION.value, CPA_State.VALID.value)
+        with np.errstate(invalid='ignore'):
+            code = np.where(np.abs(approach_rb) >= self.PI_OVER_2, CPA_State.RECEDING.value, code)
+        code = np.where(invalid, CPA_State.INVALID.value, code)
+        valid = code == CPA_State.VALID.value
+
+        # Load Output records
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dist = range_to_target * np.abs(np.cos(approach_rb))
+            time_interval = np.where(valid, dist / rel_velocity, 0.0)  # Hours
+        cpa_lat, cpa_lon, cpa_course = self.CalculatePositionCS(approach_lat, approach_lon, approach_speed,
+                                                                approach_heading, time_interval)
+
+        output = np.empty(np.broadcast(range_to_target, code, cpa_lat).shape, dtype=CPA_DTYPE)
+        output['rangeAtCPA'] = np.where(valid, range_to_target * np.abs(np.sin(approach_rb)), range_to_target)
+        output['distToCPA'] = np.where(valid, time_interval * approach_speed, range_to_target)
+        output['elapsedTime'] = 3600.0 * time_interval  # Seconds
+        output['latitude'] = np.where(valid, cpa_lat, approach_lat)
+        output['longitude'] = np.where(valid, cpa_lon, approach_lon)
+        output['code'] = code
+        return output
+
+
+if __name__ == '__main__':
+    nav = NavBatch()
+    starts = [[0.0, 0.0], [45.0, 179.5], [10.0, 10.0]]
+    ends = [[1.0, 1.0], [45.0, -179.5], [10.0, 10.01]]
+    print("Ranges (NM): " + str(60.0 * nav.GreatCircleRange(starts, ends)))
+    lats, lons, courses = nav.CalculatePositionCS(starts, [10.0, 20.0, 0.0], [45.0, 270.0, 90.0], 1.5)
+    bearings, invalid = nav.CalculateAbsBearing(starts, ends)
+    print("Bearings: " + str(bearings) + " invalid: " + str(invalid))
+    print("Dead reckoning: " + str(lats) + " " + str(lons) + " " + str(courses))
@@ -0,0 +1,219 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Command line (headless) bulk navigation computations
+ *        Bearing, Course/Speed, Course/Distance and CPA over CSV or NDJSON
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      The four pages of the Navigate window, one row per computation:
+ *          python NavCLI.py bearing|coursespeed|coursedistance|cpa
+ *                  [-i input] [-o output] [-f csv|ndjson] [-c chunkRows]
+ *      Input is read from a file or stdin a chunk of rows at a time, each
+ *      chunk is computed with NavBatch and written out before the next one
+ *      is read, so memory stays bounded whatever the length of the input.
+ *      CSV input needs a header row; NDJSON records are JSON objects.  The
+ *      input columns are passed through and the results appended.
+ *      Angles (and the running time in hours) may be decimal or DMS, with
+ *      the parts separated by spaces, colons or degree/minute/second marks,
+ *      e.g. "36 51 0", "36:51:00N", "76°17'24\"W"; a minus sign or an S or W
+ *      hemisphere letter makes the whole angle negative.
+ *      Results that cannot be computed (e.g. bearings above 85 degrees
+ *      latitude) are written as empty CSV fields or JSON nulls.
+ *****************************************************************************
+'''
+import argparse
+import csv
+import itertools
+import json
+import re
+import sys
+import numpy as np
+from NavBatch import NavBatch
+from CPA_Data import CPA_State
+
+# Operation -> [input columns, result columns]
+OPERATIONS = {
+    'bearing': [['lat1', 'lon1', 'lat2', 'lon2'], ['bearing', 'range', 'invalid']],
+    'coursespeed': [['lat1', 'lon1', 'course', 'speed', 'hours'], ['final_lat', 'final_lon']],
+    'coursedistance': [['lat1', 'lon1', 'course', 'distance'], ['final_lat', 'final_lon']],
+    'cpa': [['lat1', 'lon1', 'course1', 'speed1', 'lat2', 'lon2', 'course2', 'speed2'],
+            ['cpa_lat', 'cpa_lon', 'dist_to_cpa', 'range_at_cpa', 'elapsed_hours', 'status']],
+}
+
+# Columns that may be given in Deg-Min-Sec (or Hrs-Min-Sec)
+DMS_COLUMNS = ('lat1', 'lon1', 'lat2', 'lon2', 'course', 'course1', 'course2', 'hours')
+
+DMS_PATTERN = re.compile(r'^([NSEW]?)\s*(-?)\s*([0-9.]+)(?:[\s:\u00b0\'"]+([0-9.]+))?(?:[\s:\'"]+([0-9.]+))?[\s\'"]*([NSEW]?)$')
+
+class NavCLI(NavBatch):
+
+    def parseAngle(self, theText):
+        """ Convert a decimal or Deg-Min-Sec angle string to decimal degrees. """
+        text = str(theText).strip()
+        try:
+            return float(text)
+        except ValueError:
+            pass
+        match = DMS_PATTERN.match(text.upper())
+        if match is None or (match.group(1) and match.group(6)):
+            raise ValueError("Not an angle: '" + text + "'")
+        hemisphere = match.group(1) or match.group(6)
+        dms = [float(p) if p else 0.0 for p in match.group(3, 4, 5)]
+        value = self.dms2dec(dms)
+        return -value if match.group(2) or hemisphere in ('S', 'W') else value
+
+    def parseColumn(self, theName, theValues, theFirstRow):
+        """ Convert a column of text (or JSON) values to a float64 array. """
+        try:
+            return np.array(theValues, dtype=np.float64)
+        except (ValueError, TypeError):
+            pass
+        if theName not in DMS_COLUMNS:
+            raise ValueError("Column '" + theName + "' near row " + str(theFirstRow) + " is not numeric")
+        values = np.empty(len(theValues))
+        for i, text in enumerate(theValues):
+            try:
+                values[i] = self.parseAngle(text)
+            except ValueError as err:
+                raise ValueError("Column '" + theName + "' row " + str(theFirstRow + i) + ": " + str(err))
+        return values
+
+    def compute(self, theOperation, c):
+        """ Run one operation over a chunk; c maps the input column names to arrays. """
+        if theOperation == 'bearing':
+            bearing, invalid = self.CalculateAbsBearing(c['lat1'], c['lon1'], c['lat2'], c['lon2'])
+            arange = self.NM_PER_DEGREE * self.GreatCircleRange(c['lat1'], c['lon1'], c['lat2'], c['lon2'])
+            return [bearing, arange, invalid.astype(np.int8)]
+        if theOperation == 'coursespeed':
+            lat, lon, course = self.CalculatePositionCS(c['lat1'], c['lon1'], c['speed'], c['course'], c['hours'])
+            return [lat, lon]
+        if theOperation == 'coursedistance':
+            lat, lon, course = self.GreatCircle(c['lat1'], c['lon1'], c['course'], c['distance'])
+            return [lat, lon]
+        cpa = self.CalculateCPA(np.column_stack((c['lat1'], c['lon1'])), c['course1'], c['speed1'],
+                                np.column_stack((c['lat2'], c['lon2'])), c['course2'], c['speed2'])
+        status = np.array([state.name for state in CPA_State], dtype=object)[cpa['code'] - 1]
+        return [cpa['latitude'], cpa['longitude'], cpa['distToCPA'], cpa['rangeAtCPA'],
+                cpa['elapsedTime'] / 3600.0, status]
+
+    def resultLists(self, theResults):
+        """ Convert result arrays to lists, with None in place of NaN. """
+        lists = []
+        for result in theResults:
+            values = result.tolist()
+            if result.dtype.kind == 'f' and np.isnan(result).any():
+                values = [None if v != v else v for v in values]
+            lists.append(values)
+        return lists
+
+    def csvChunks(self, theInput, theChunkRows):
+        """ Yield [header, rows] a chunk of rows at a time. """
+        reader = csv.reader(theInput)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip() for name in header]
+        while True:
+            rows = list(itertools.islice(reader, theChunkRows))
+            if len(rows) == 0:
+                return
+            yield [header, rows]
+
+    def runCSV(self, theOperation, theInput, theOutput, theChunkRows):
+        inputs, outputs = OPERATIONS[theOperation]
+        writer = csv.writer(theOutput, lineterminator='\n')
+        first_row = 1
+        wrote_header = False
+        for header, rows in self.csvChunks(theInput, theChunkRows):
+            missing = [name for name in inputs if name not in header]
+            if missing:
+                raise ValueError("Missing input columns: " + ", ".join(missing))
+            if not wrote_header:
+                writer.writerow(header + outputs)
+                wrote_header = True
+            for i, row in enumerate(rows):
+                if len(row) < len(header):
+                    raise ValueError("Row " + str(first_row + i) + " has " + str(len(row)) + " of the "
+                                     + str(len(header)) + " columns")
+            columns = {}
+            for name in inputs:
+                ix = header.index(name)
+                columns[name] = self.parseColumn(name, [row[ix] for row in rows], first_row)
+            results = self.resultLists(self.compute(theOperation, columns))
+            writer.writerows(row + list(values) for row, values in zip(rows, zip(*results)))
+            first_row += len(rows)
+
+    def runNDJSON(self, theOperation, theInput, theOutput, theChunkRows):
+        inputs, outputs = OPERATIONS[theOperation]
+        lines = (line for line in theInput if line.strip())
+        first_row = 1
+        while True:
+            records = []
+            for line in itertools.islice(lines, theChunkRows):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as err:
+                    raise ValueError("Row " + str(first_row + len(records)) + " is not valid JSON: " + str(err))
+                if not isinstance(record, dict):
+                    raise ValueError("Row " + str(first_row + len(records)) + " is not a JSON object")
+                records.append(record)
+            if len(records) == 0:
+                return
+            columns = {}
+            for name in inputs:
+                try:
+                    columns[name] = self.parseColumn(name, [record[name] for record in records], first_row)
+                except KeyError:
+                    raise ValueError("Missing input field '" + name + "' near row " + str(first_row))
+            results = self.resultLists(self.compute(theOperation, columns))
+            for record, values in zip(records, zip(*results)):
+                record.update(zip(outputs, values))
+                theOutput.write(json.dumps(record) + '\n')
+            first_row += len(records)
+
+    def run(self, theOperation, theInput, theOutput, theFormat = 'csv', chunkRows = 65536):
+        """ Stream theInput to theOutput (text files), computing theOperation on every row. """
+        if theFormat == 'ndjson':
+            self.runNDJSON(theOperation, theInput, theOutput, chunkRows)
+        else:
+            self.runCSV(theOperation, theInput, theOutput, chunkRows)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Bulk navigation computations over CSV or NDJSON.")
+    parser.add_argument('operation', choices=sorted(OPERATIONS))
+    parser.add_argument('-i', '--input', default='-', help="input file (default stdin)")
+    parser.add_argument('-o', '--output', default='-', help="output file (default stdout)")
+    parser.add_argument('-f', '--format', choices=['csv', 'ndjson'], default=None,
+                        help="input/output format (default from the input file name, else csv)")
+    parser.add_argument('-c', '--chunk', type=int, default=65536, help="rows per chunk")
+    args = parser.parse_args(argv)
+
+    data_format = args.format
+    if data_format is None:
+        data_format = 'ndjson' if args.input.endswith(('.ndjson', '.jsonl')) else 'csv'
+    source = sys.stdin
+    sink = sys.stdout
+    try:
+        if args.input != '-':
+            source = open(args.input, newline='')
+        if args.output != '-':
+            sink = open(args.output, 'w', newline='')
+        NavCLI().run(args.operation, source, sink, data_format, max(1, args.chunk))
+    except (ValueError, OSError) as err:
+        sys.stderr.write("NavCLI: " + str(err) + "\n")
+        return 2
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Memoized range and bearing computations
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      CachedNavUtils is a drop-in NavUtils whose GreatCircleRange and
+ *      CalculateAbsBearing answers are kept in bounded LRU caches.  The key
+ *      is the pair of positions with each coordinate quantized to a
+ *      multiple of the quantum (degrees), so positions closer than the
+ *      quantum share an answer.  The caches are guarded by a lock and may
+ *      be shared between threads; a value is computed outside the lock, so
+ *      two threads missing on the same key may both compute it.
+ *      Errors (e.g. LatitudeLimitError) are not cached, nor are the answers
+ *      of the approximate AccuracyModes, which cost less than a lookup.
+ *****************************************************************************
+'''
+import threading
+from collections import OrderedDict
+from NavUtils import NavUtils
+from NavUtils import EXACT_MODE
+
+class LRUCache(object):
+    """ A thread-safe bounded mapping that evicts the least recently used entry. """
+
+    def __init__(self, maxSize):
+        self.maxSize = max(1, int(maxSize))
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """ Return the cached value, or None on a miss. """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxSize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """ Return the counters as a dict: hits, misses, evictions, size, maxSize, hitRate. """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self.entries), 'maxSize': self.maxSize,
+                    'hitRate': self.hits / lookups if lookups > 0 else 0.0}
+
+
+class CachedNavUtils(NavUtils):
+
+    def __init__(self, maxSize = 65536, quantum = 1.0e-7):
+        self.quantum = quantum
+        self.rangeCache = LRUCache(maxSize)
+        self.bearingCache = LRUCache(maxSize)
+
+    def cacheKey(self, aStartPosition, anEndPosition):
+        q = self.quantum
+        return (round(aStartPosition.getLatitude() / q), round(aStartPosition.getLongitude() / q),
+                round(anEndPosition.getLatitude() / q), round(anEndPosition.getLongitude() / q))
+
+    def GreatCircleRange(self, aStartPosition, anEndPosition, mode = None):
+        """ NavUtils.GreatCircleRange through the range cache (exact mode only). """
+        if (mode or self.accuracyMode) is not EXACT_MODE:
+            return NavUtils.GreatCircleRange(self, aStartPosition, anEndPosition, mode)
+        key = self.cacheKey(aStartPosition, anEndPosition)
+        arange = self.rangeCache.get(key)
+        if arange is None:
+            arange = NavUtils.GreatCircleRange(self, aStartPosition, anEndPosition)
+            self.rangeCache.put(key, arange)
+        return arange
+
+    def CalculateAbsBearing(self, aStartPosition, anEndPosition, mode = None):
+        """ NavUtils.CalculateAbsBearing through the bearing cache (exact mode only). """
+        if (mode or self.accuracyMode) is not EXACT_MODE:
+            return NavUtils.CalculateAbsBearing(self, aStartPosition, anEndPosition, mode)
+        key = self.cacheKey(aStartPosition, anEndPosition)
+        bearing = self.bearingCache.get(key)
+        if bearing is None:
+            bearing = NavUtils.CalculateAbsBearing(self, aStartPosition, anEndPosition)
+            self.bearingCache.put(key, bearing)
+        return bearing
+
+    def cacheStats(self):
+        """ Return the counters of both caches: {'range': {...}, 'bearing': {...}}. """
+        return {'range': self.rangeCache.stats(), 'bearing': self.bearingCache.stats()}
+
+    def clearCache(self):
+        self.rangeCache.clear()
+        self.bearingCache.clear()
+
+
+if __name__ == '__main__':
+    from GeographicPosition import GeographicPosition
+    nav = CachedNavUtils(maxSize = 16)
+    ports = [GeographicPosition(36.85, -76.29), GeographicPosition(40.70, -74.01), GeographicPosition(25.77, -80.19)]
+    for i in range(3):
+        for a in ports:
+            for b in ports:
+                nav.GreatCircleRange(a, b)
+    print(nav.cacheStats())
@@ -11,7 +11,7 @@
  ***************************************************************************** 
 '''
 import math
-import NavError as NavError
+from NavException import TimeRangeError
 
 class NavCommon(object):
     """ Handy Constants and functions. """   
@@ -68,9 +68,9 @@ class NavCommon(object):
     
     def hrs2hms(self,hrs):
         """ Decimal Hours to Hour-Min-Sec (list) """
-        ihr, imn, isc = self.dms2dec(hrs)
+        ihr, imn, isc = self.dec2dms(hrs)
         if(ihr >= 24):
-                NavError("Hours is greater than 24")
+            raise TimeRangeError("Hours is greater than 24")
         return [ihr, imn, isc]
     
     def hms2hrs(self, hms):
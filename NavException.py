@@ -0,0 +1,25 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Exceptions raised by the navigation computations
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      The computational modules raise these instead of opening a dialog, so
+ *      they can run headless.  The GUI (Navigate) catches NavException and
+ *      shows the message with the NavError dialog.
+ *****************************************************************************
+'''
+class NavException(Exception):
+    """ Base class of the navigation computation errors. """
+
+class LatitudeLimitError(NavException):
+    """ A track is above or below the latitude limit of a computation (85 degrees). """
+
+class TimeRangeError(NavException):
+    """ A time is outside its allowed range. """
+
+class AntipodalError(NavException):
+    """ The ends of a great circle leg are antipodal, so the leg is not defined. """
@@ -0,0 +1,197 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Run the batch navigation computations across a pool of processes
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Inputs are copied once into multiprocessing.shared_memory blocks and
+ *      the outputs are allocated there too; the workers are only sent the
+ *      block names and a row range, never the data.  Each chunk of rows is
+ *      computed by the NavBatch (or CPAScreen) method of the same name and
+ *      written into its own rows of the outputs, so the results are in
+ *      input order and identical whatever the number of workers or the
+ *      order in which the chunks finish.
+ *      Inputs are either sharded (split by rows) or whole (every chunk sees
+ *      all of it, e.g. the target fleet of an all-pairs CPA screen).
+ *      Uses only the standard library and NumPy; no scheduler is needed.
+ *****************************************************************************
+'''
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from NavBatch import NavBatch
+from NavBatch import CPA_DTYPE
+
+def workerInstance(theClassName):
+    if theClassName == 'CPAScreen':
+        from CPAScreen import CPAScreen
+        return CPAScreen()
+    return NavBatch()
+
+def runChunk(theTask):
+    """
+        Compute one chunk in a worker.  theTask is (className, methodName, inputs, outputs,
+        start, stop); inputs are ('shard', block), ('whole', block) or ('value', value) and
+        outputs are blocks, a block being (name, shape, dtype).
+    """
+    class_name, method_name, inputs, outputs, start, stop = theTask
+    attached = []
+
+    def attach(theBlock):
+        name, shape, dtype = theBlock
+        shm = shared_memory.SharedMemory(name=name)
+        attached.append(shm)
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    try:
+        args = []
+        for kind, value in inputs:
+            if kind == 'value':
+                args.append(value)
+            elif kind == 'shard':
+                args.append(attach(value)[start:stop])
+            else:
+                args.append(attach(value))
+        result = getattr(workerInstance(class_name), method_name)(*args)
+        if not isinstance(result, list):
+            result = [result]
+        for block, value in zip(outputs, result):
+            attach(block)[start:stop] = value
+        del args, result
+    finally:
+        for shm in attached:
+            shm.close()
+    return start
+
+
+class NavParallel(object):
+
+    def __init__(self, workers = None, chunkSize = 1 << 16):
+        """
+            workers processes (default: one per CPU) each compute chunkSize rows (or, for
+            pairwise screens, about chunkSize pairs) at a time.  With workers = 1 the chunks
+            are run in this process.
+        """
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunkSize = max(1, int(chunkSize))
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        """ Shut the worker pool down. """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def share(self, theArray, blocks):
+        """ Copy an array into a new shared memory block; returns its (name, shape, dtype). """
+        array = np.ascontiguousarray(theArray)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        blocks.append(shm)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        return (shm.name, array.shape, array.dtype)
+
+    def run(self, theClassName, theMethodName, theInputs, theOutputs, theRows, chunkRows = None):
+        """
+            Run theClassName.theMethodName over theRows rows in chunks.  theInputs is a list of
+            ('shard', array), ('whole', array) or ('value', value); sharded arrays are split
+            along their first axis.  theOutputs is a list of (shape, dtype), one per result
+            of the method, whose first axis is the rows.  Returns the output arrays.
+        """
+        chunk_rows = chunkRows if chunkRows is not None else self.chunkSize
+        blocks = []
+        try:
+            inputs = []
+            for kind, value in theInputs:
+                if kind == 'value':
+                    inputs.append((kind, value))
+                else:
+                    inputs.append((kind, self.share(value, blocks)))
+            outputs = [self.share(np.empty(shape, dtype=dtype), blocks) for shape, dtype in theOutputs]
+
+            tasks = [(theClassName, theMethodName, inputs, outputs, start, min(start + chunk_rows, theRows))
+                     for start in range(0, theRows, chunk_rows)]
+            if self.workers == 1 or len(tasks) <= 1:
+                for task in tasks:
+                    runChunk(task)
+            else:
+                if self.pool is None:
+                    self.pool = multiprocessing.get_context().Pool(self.workers)
+                for start in self.pool.imap_unordered(runChunk, tasks):
+                    pass
+
+            results = []
+            for shm, (name, shape, dtype) in zip(blocks[len(blocks) - len(outputs):], outputs):
+                results.append(np.array(np.ndarray(shape, dtype=dtype, buffer=shm.buf)))
+            return results
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    def rowArrays(self, *theArrays):
+        """ Broadcast 1-D inputs to a common length; returns [rows, arrays...]. """
+        arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(a, dtype=np.float64)) for a in theArrays])
+        return [len(arrays[0])] + list(arrays)
+
+    def GreatCircleRange(self, startLat, startLon, endLat, endLon):
+        """ NavBatch.GreatCircleRange (degrees) sharded over the pool. """
+        rows, *arrays = self.rowArrays(startLat, startLon, endLat, endLon)
+        return self.run('NavBatch', 'GreatCircleRange', [('shard', a) for a in arrays],
+                        [((rows,), np.float64)], rows)[0]
+
+    def CalculateAbsBearing(self, startLat, startLon, endLat, endLon):
+        """ NavBatch.CalculateAbsBearing sharded over the pool.  Returns [bearings, invalid]. """
+        rows, *arrays = self.rowArrays(startLat, startLon, endLat, endLon)
+        return self.run('NavBatch', 'CalculateAbsBearing', [('shard', a) for a in arrays],
+                        [((rows,), np.float64), ((rows,), bool)], rows)
+
+    def CalculatePositionCS(self, lats, lons, speeds, headings, timeInterval):
+        """ NavBatch.CalculatePositionCS sharded over the pool.  Returns [lats, lons, courses]. """
+        rows, *arrays = self.rowArrays(lats, lons, speeds, headings)
+        return self.run('NavBatch', 'CalculatePositionCS',
+                        [('shard', a) for a in arrays] + [('value', float(timeInterval))],
+                        [((rows,), np.float64)] * 3, rows)
+
+    def CalculateCPA(self, approachLat, approachLon, approachCourse, approachSpeed,
+                           targetLat, targetLon, targetCourse, targetSpeed):
+        """ Element-wise NavBatch.CalculateCPA sharded over the pool.  Returns a CPA_DTYPE array. """
+        rows, alat, alon, acrs, aspd, tlat, tlon, tcrs, tspd = self.rowArrays(
+            approachLat, approachLon, approachCourse, approachSpeed, targetLat, targetLon, targetCourse, targetSpeed)
+        inputs = [('shard', np.column_stack((alat, alon))), ('shard', acrs), ('shard', aspd),
+                  ('shard', np.column_stack((tlat, tlon))), ('shard', tcrs), ('shard', tspd)]
+        return self.run('NavBatch', 'CalculateCPA', inputs, [((rows,), CPA_DTYPE)], rows)[0]
+
+    def screenFleets(self, theApproachFleet, theTargetFleet):
+        """
+            CPAScreen.screenFleets (all approach tracks against all target tracks) with the
+            approach rows sharded over the pool.  Returns the N x M CPA_DTYPE array.
+        """
+        approach = np.asarray(theApproachFleet, dtype=np.float64)
+        target = np.asarray(theTargetFleet, dtype=np.float64)
+        rows = len(approach)
+        chunk_rows = max(1, self.chunkSize // max(1, len(target)))
+        return self.run('CPAScreen', 'screenFleets', [('shard', approach), ('whole', target)],
+                        [((rows, len(target)), CPA_DTYPE)], rows, chunk_rows)[0]
+
+
+if __name__ == '__main__':
+    import time
+    rng = np.random.default_rng(0)
+    fleet = np.column_stack((rng.uniform(30.0, 40.0, 3000), rng.uniform(-75.0, -65.0, 3000),
+                             rng.uniform(0.0, 360.0, 3000), rng.uniform(5.0, 25.0, 3000)))
+    with NavParallel() as parallel:
+        begin = time.time()
+        cpa = parallel.screenFleets(fleet, fleet)
+        print(str(parallel.workers) + " workers: " + str(cpa.shape) + " CPAs in " + str(time.time() - begin) + " s")
@@ -0,0 +1,199 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Local asyncio service answering navigation requests in batches
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      JSON-lines over TCP or a Unix socket.  Each request is one line:
+ *          {"id": 7, "op": "bearing", "lat1": 36.85, "lon1": -76.29,
+ *           "lat2": 40.7, "lon2": -74.0}
+ *      and is answered, possibly out of order, by one line:
+ *          {"id": 7, "result": {"bearing": ..., "range": ..., "invalid": 0}}
+ *      or {"id": 7, "error": "..."}.  The operations and their fields are
+ *      those of NavCLI (bearing, coursespeed, coursedistance, cpa); angles
+ *      may be decimal or DMS strings.  "stats" returns the counters and the
+ *      p50/p99 latency (ms) of recent requests.
+ *      Requests are checked when they arrive and queued per operation.  A
+ *      queue is computed as one NavBatch call as soon as it holds maxBatch
+ *      requests or maxWait seconds after its first request, whichever comes
+ *      first, so concurrent clients share each vectorized call.
+ *      Everything runs in one event loop; nothing leaves the host.
+ *****************************************************************************
+'''
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+import numpy as np
+from NavCLI import NavCLI
+from NavCLI import OPERATIONS
+
+class MicroBatcher(object):
+    """ Collects the requests of one operation and computes them together. """
+
+    def __init__(self, theService, theOperation):
+        self.service = theService
+        self.operation = theOperation
+        self.pending = []
+        self.timer = None
+
+    def submit(self, theValues):
+        """ Queue one request (its input values in OPERATIONS order); returns a future of its result. """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((theValues, future))
+        if len(self.pending) >= self.service.maxBatch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.service.maxWait, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch = self.pending
+        self.pending = []
+        if len(batch) == 0:
+            return
+        inputs, outputs = OPERATIONS[self.operation]
+        try:
+            rows = np.array([values for values, future in batch], dtype=np.float64)
+            columns = {name: rows[:, i] for i, name in enumerate(inputs)}
+            results = self.service.nav.resultLists(self.service.nav.compute(self.operation, columns))
+        except Exception as err:
+            for values, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        self.service.batches += 1
+        self.service.batched += len(batch)
+        for (values, future), row in zip(batch, zip(*results)):
+            if not future.done():
+                future.set_result(dict(zip(outputs, row)))
+
+
+class NavService(object):
+
+    def __init__(self, maxBatch = 1024, maxWait = 0.002, latencyWindow = 10000):
+        """
+            maxBatch requests at most per computation, waiting at most maxWait seconds for a
+            batch to fill.  Latency percentiles cover the last latencyWindow requests.
+        """
+        self.maxBatch = max(1, int(maxBatch))
+        self.maxWait = max(0.0, float(maxWait))
+        self.nav = NavCLI()
+        self.batchers = {}
+        self.latencies = deque(maxlen=latencyWindow)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched = 0
+
+    def stats(self):
+        """ Counters and the p50/p99 latency (ms) of the recent requests. """
+        latencies = np.array(self.latencies)
+        return {'requests': self.requests, 'errors': self.errors, 'batches': self.batches,
+                'meanBatch': self.batched / self.batches if self.batches > 0 else 0.0,
+                'p50ms': float(np.percentile(latencies, 50)) * 1000.0 if len(latencies) > 0 else None,
+                'p99ms': float(np.percentile(latencies, 99)) * 1000.0 if len(latencies) > 0 else None}
+
+    def parseRequest(self, theRequest):
+        """ Return [operation, values] for a request, raising ValueError if it is malformed. """
+        operation = theRequest.get('op')
+        if operation not in OPERATIONS:
+            raise ValueError("Unknown op '" + str(operation) + "'")
+        values = []
+        for name in OPERATIONS[operation][0]:
+            if name not in theRequest:
+                raise ValueError("Missing field '" + name + "'")
+            value = theRequest[name]
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values.append(float(value))
+            else:
+                values.append(float(self.nav.parseColumn(name, [value], 1)[0]))
+        return [operation, values]
+
+    async def answer(self, theLine):
+        """ Compute the response (a dict) to one request line. """
+        try:
+            request = json.loads(theLine)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as err:
+            return {'id': None, 'error': str(err)}
+        response = {'id': request.get('id')}
+        try:
+            if request.get('op') == 'stats':
+                response['result'] = self.stats()
+                return response
+            operation, values = self.parseRequest(request)
+            batcher = self.batchers.get(operation)
+            if batcher is None:
+                batcher = self.batchers[operation] = MicroBatcher(self, operation)
+            response['result'] = await batcher.submit(values)
+        except Exception as err:
+            self.errors += 1
+            response['error'] = str(err)
+        return response
+
+    async def handleRequest(self, theLine, theWriter, theArrival):
+        self.requests += 1
+        response = await self.answer(theLine)
+        theWriter.write((json.dumps(response) + '\n').encode())
+        self.latencies.append(time.perf_counter() - theArrival)
+
+    async def handleConnection(self, theReader, theWriter):
+        tasks = set()
+        try:
+            while True:
+                line = await theReader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self.handleRequest(line, theWriter, time.perf_counter()))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    if theWriter.transport.get_write_buffer_size() > (1 << 20):
+                        await theWriter.drain()
+            if tasks:
+                await asyncio.gather(*tasks)
+            await theWriter.drain()
+        except ConnectionError:
+            pass
+        finally:
+            theWriter.close()
+
+    async def serve(self, host = '127.0.0.1', port = 8642, path = None):
+        """ Serve on TCP host:port, or on the Unix socket path if one is given, until cancelled. """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handleConnection, path=path, backlog=1024)
+        else:
+            server = await asyncio.start_server(self.handleConnection, host=host, port=port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Local JSON-lines navigation service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8642)
+    parser.add_argument('--unix', default=None, help="serve on this Unix socket path instead of TCP")
+    parser.add_argument('--max-batch', type=int, default=1024)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args(argv)
+    service = NavService(args.max_batch, args.max_wait_ms / 1000.0)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Opt-in instrumentation of the NavUtils hot paths
+ *        Call counts, cumulative time, latency histograms, branch counters
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Off by default.  NAV_STATS.enable() replaces the NavUtils methods named
+ *      in TIMED_METHODS with timing wrappers and sets ENABLED;
+ *      NAV_STATS.disable() puts the original methods back.  While disabled the
+ *      only cost is a check of ENABLED inside the special-case branches of
+ *      NavUtils, which are counted when it is set:
+ *          CalculateCPA.NO_RELATIVE_MOTION, CalculateCPA.RECEDING,
+ *          GreatCircleRange.linear (under five miles),
+ *          rhumb_line.greatCircle (above the latitude tolerance),
+ *          CalculateBearing.latitudeLimit (the 85 degree rejection).
+ *      Times are inclusive: CalculateCPA's time includes its calls to
+ *      GreatCircleRange and CalculateBearing, which are counted as well.
+ *      The latency histogram has power of two buckets in nanoseconds.
+ *      Counters are updated without a lock, so counts from several
+ *      threads may be slightly low.  Scrape with NAV_STATS.snapshot(), or
+ *      NAV_STATS.snapshot(reset=True) for counts since the last scrape.
+ *****************************************************************************
+'''
+import time
+
+# Set while the instrumentation is enabled; NavUtils checks it before counting a branch
+ENABLED = False
+
+# NavUtils methods timed while enabled
+TIMED_METHODS = ('GreatCircle', 'GreatCircleRange', 'rhumb_line', 'CalculateBearing', 'CalculateAbsBearing',
+                 'CalculatePositionXY', 'CalculateXY', 'CalculatePositionCS', 'CalculateCPA',
+                 'CalculatePerpendicularDistance', 'findMinimumDistanceIndices', 'NewPositionFraction')
+
+HISTOGRAM_BUCKETS = 64
+
+class FunctionStats(object):
+    """ Call count, cumulative time and latency histogram of one method. """
+    __slots__ = ('calls', 'totalNs', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.totalNs = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def reset(self):
+        self.calls = 0
+        self.totalNs = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, elapsedNs):
+        self.calls += 1
+        self.totalNs += elapsedNs
+        self.histogram[min(elapsedNs.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def summary(self):
+        """ Return the counters as a dict; the histogram maps bucket upper bounds (ns) to counts. """
+        return {'calls': self.calls, 'totalSeconds': self.totalNs * 1.0e-9,
+                'meanSeconds': self.totalNs * 1.0e-9 / self.calls if self.calls > 0 else 0.0,
+                'histogram': {1 << i: count for i, count in enumerate(self.histogram) if count > 0}}
+
+
+class NavStats(object):
+
+    def __init__(self):
+        self.functions = {}
+        self.branches = {}
+        self.originals = {}
+        self.since = time.time()
+
+    def branch(self, theName):
+        """ Count one pass through the named branch. """
+        self.branches[theName] = self.branches.get(theName, 0) + 1
+
+    def timed(self, theName, theFunction):
+        """ Return theFunction wrapped to record its calls in the stats of theName. """
+        stats = self.functions.get(theName)
+        if stats is None:
+            stats = self.functions[theName] = FunctionStats()
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return theFunction(*args, **kwargs)
+            finally:
+                stats.record(clock() - start)
+        wrapper.__name__ = theFunction.__name__
+        wrapper.__doc__ = theFunction.__doc__
+        wrapper.__wrapped__ = theFunction
+        return wrapper
+
+    def enable(self, theMethods = TIMED_METHODS):
+        """ Start timing theMethods of NavUtils and counting the branches. """
+        global ENABLED
+        from NavUtils import NavUtils
+        for name in theMethods:
+            if name not in self.originals:
+                self.originals[name] = NavUtils.__dict__[name]
+                setattr(NavUtils, name, self.timed(name, self.originals[name]))
+        ENABLED = True
+
+    def disable(self):
+        """ Restore the original NavUtils methods and stop counting; the counters are kept. """
+        global ENABLED
+        from NavUtils import NavUtils
+        ENABLED = False
+        for name, function in self.originals.items():
+            setattr(NavUtils, name, function)
+        self.originals = {}
+
+    def isEnabled(self):
+        return ENABLED
+
+    def reset(self):
+        """ Zero every counter. """
+        for stats in self.functions.values():
+            stats.reset()
+        self.branches = {}
+        self.since = time.time()
+
+    def snapshot(self, reset = False):
+        """
+            Return the counters as a dict: enabled, since and until (epoch seconds), functions
+            (name -> calls, totalSeconds, meanSeconds, histogram) and branches (name -> count).
+            With reset the counters are zeroed, so the next snapshot covers only what follows.
+        """
+        now = time.time()
+        snapshot = {'enabled': ENABLED, 'since': self.since, 'until': now,
+                    'functions': {name: stats.summary() for name, stats in self.functions.items() if stats.calls > 0},
+                    'branches': dict(self.branches)}
+        if reset:
+            self.reset()
+            self.since = now
+        return snapshot
+
+
+# The instrumentation shared by every NavUtils
+NAV_STATS = NavStats()
+
+
+if __name__ == '__main__':
+    import json
+    from NavStats import NAV_STATS      # The instance NavUtils sees, not this __main__ copy
+    from NavUtils import NavUtils
+    from GeographicPosition import GeographicPosition
+    from NavException import LatitudeLimitError
+    nav = NavUtils()
+    NAV_STATS.enable()
+    start = GeographicPosition(36.85, -76.29)
+    for target in (GeographicPosition(36.86, -76.28), GeographicPosition(40.7, -74.0), GeographicPosition(86.0, 0.0)):
+        nav.rhumb_line(target.getLatitude(), target.getLongitude(), 45.0, 100.0)
+        try:
+            nav.CalculateCPA(start, 45.0, 12.0, target, 45.0, 12.0)
+            nav.CalculateCPA(start, 225.0, 12.0, target, 45.0, 12.0)
+        except LatitudeLimitError:
+            pass
+    NAV_STATS.disable()
+    print(json.dumps(NAV_STATS.snapshot(), indent=1))
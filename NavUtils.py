@@ -10,24 +10,56 @@
  ***************************************************************************** 
  *  DESIGN NOTES:
  *      Translated from Java version (fortran -> c -> C++ -> Java -> Python3)
+ *      Every method taking a GeographicPosition also takes a PreparedPosition
+ *      and then uses its cached radians, sin/cos and Mercator terms.
+ *      Range, bearing and dead reckoning take an AccuracyMode: per call
+ *      (mode=), per instance or for every NavUtils (the accuracyMode
+ *      attribute).  The approximations are for short ranges; above the
+ *      latitude tolerance range and dead reckoning use the exact equations.
  ***************************************************************************** 
 '''
 import math
 import sys
 from enum import Enum
 from NavCommon import NavCommon
-from NavError import NavError
+from NavException import LatitudeLimitError
 from CPA_Data import CPAData
 from CPA_Data import CPA_State
 from GeographicPosition import GeographicPosition
+from PreparedPosition import PreparedPosition
+import NavStats
 
 class BearingType(Enum):
     ABSOLUTE = 1
     RELATIVE = 2
-    
+
+class AccuracyMode(Enum):
+    EXACT = 1               # Spherical great circle range and course, Mercator bearing
+    EQUIRECTANGULAR = 2     # Plane scaled by the cosine of the mean latitude
+    FLAT_EARTH = 3          # Plane tangent at the start, scaled by the cosine of its latitude
+
+# Compared on every call, so kept out of the Enum lookup
+EXACT_MODE = AccuracyMode.EXACT
+FLAT_EARTH_MODE = AccuracyMode.FLAT_EARTH
+
 class NavUtils(NavCommon):
+    accuracyMode = EXACT_MODE
 
-    def GreatCircle(self, aLatitude, aLongitude, aCourse, aDistance):
+    def prepare(self, aPosition):
+        """ Return the position as a PreparedPosition (itself if it already is one). """
+        if isinstance(aPosition, PreparedPosition):
+            return aPosition
+        return PreparedPosition(aPosition)
+
+    def positionTerms(self, aPosition):
+        """ Return [lat (rad), lon (rad), sin(lat), cos(lat)], cached if the position is prepared. """
+        if isinstance(aPosition, PreparedPosition):
+            return [aPosition.latRad, aPosition.lonRad, aPosition.sinLat, aPosition.cosLat]
+        lat = self.toRadians(aPosition.getLatitude())
+        return [lat, self.toRadians(aPosition.getLongitude()), math.sin(lat), math.cos(lat)]
+
+
+    def GreatCircle(self, aLatitude, aLongitude, aCourse, aDistance, mode = None):
         """
         This procedure will calculate the new position of a given track as
         a result of the distance traveled over the given distance.
@@ -41,14 +73,25 @@ class NavUtils(NavCommon):
 
         The great circle equations were derived from the American Practical Navigator (Bowditch).
         """
+        latitude = self.toRadians(aLatitude)
+        if mode is None:
+            mode = self.accuracyMode
+        if mode is not EXACT_MODE:
+            return self.approximatePosition(latitude, self.toRadians(aLongitude), math.cos(latitude),
+                                            aCourse, aDistance, mode)
+        return self.greatCircleTerms(latitude, self.toRadians(aLongitude), math.sin(latitude), math.cos(latitude),
+                                     aCourse, aDistance)
+
+    def greatCircleTerms(self, latitude, longitude, sin_lat, cos_lat, aCourse, aDistance):
+        """
+            GreatCircle from a start latitude and longitude in radians and the sin and cos of
+            the latitude.
+        """
         eff_rad_0 = 0.000005
         
         sin_crs = math.sin(self.toRadians(aCourse))
         cos_crs = math.cos(self.toRadians(aCourse))
 
-        sin_lat = math.sin(self.toRadians(aLatitude))
-        cos_lat = math.cos(self.toRadians(aLatitude))
-
         cos_dist = math.cos(self.toRadians(aDistance / self.NM_PER_DEGREE))
         sin_dist = math.sin(self.toRadians(aDistance / self.NM_PER_DEGREE))
 
@@ -73,12 +116,12 @@ class NavUtils(NavCommon):
         if (self.toRadians(aCourse) < 0.0):
             new_crs = -(new_crs)
 
-        new_long = self.toRadians(aLongitude)
+        new_long = longitude
         
         # Check for polar crossing
         if (abs(self.toRadians(aCourse)) < eff_rad_0 or (abs(self.toRadians(aCourse) - self.RAD_180) < eff_rad_0)):
             if (abs(new_crs - self.toRadians(aCourse)) > self.RAD_90):
-                if(self.toRadians(aLongitude) < 0.0):
+                if(longitude < 0.0):
                     adjustment = self.RAD_180
                 else:
                     adjustment = -self.RAD_180
@@ -142,15 +185,27 @@ class NavUtils(NavCommon):
             newPositionLon += 360.0
         return newPositionLon
     
-    def GreatCircleRange(self, aStartPosition, anEndPosition):
+    def GreatCircleRange(self, aStartPosition, anEndPosition, mode = None):
         """ 
             Given starting and ending geographic positions, computes the distance (in degrees) between
             the two points.  Distance may be converted tp NM by multiplying by 60.0
         """
-        source_lat = self.toRadians(aStartPosition.getLatitude())
-        source_long = self.toRadians(aStartPosition.getLongitude())
-        tgt_lat = self.toRadians(anEndPosition.getLatitude())
-        tgt_long = self.toRadians(anEndPosition.getLongitude())
+        if isinstance(aStartPosition, PreparedPosition):
+            source_lat = aStartPosition.latRad
+            source_long = aStartPosition.lonRad
+            cos_source = aStartPosition.cosLat
+        else:
+            source_lat = self.toRadians(aStartPosition.getLatitude())
+            source_long = self.toRadians(aStartPosition.getLongitude())
+            cos_source = math.cos(source_lat)
+        if isinstance(anEndPosition, PreparedPosition):
+            tgt_lat = anEndPosition.latRad
+            tgt_long = anEndPosition.lonRad
+            cos_tgt = anEndPosition.cosLat
+        else:
+            tgt_lat = self.toRadians(anEndPosition.getLatitude())
+            tgt_long = self.toRadians(anEndPosition.getLongitude())
+            cos_tgt = math.cos(tgt_lat)
 
         #  compute delta lat and delta long
         delta_lat  = source_lat - tgt_lat
@@ -161,9 +216,19 @@ class NavUtils(NavCommon):
             delta_long = delta_long - self.RAD_360
         elif (delta_long < -self.RAD_180):
             delta_long = delta_long + self.RAD_360
+
+        #  approximate modes: distance on a plane, except beyond the latitude tolerance
+        if mode is None:
+            mode = self.accuracyMode
+        if (mode is not EXACT_MODE and abs(source_lat) <= self.LAT_TOLERANCE and abs(tgt_lat) <= self.LAT_TOLERANCE):
+            if (mode is FLAT_EARTH_MODE):
+                scale = cos_source
+            else:
+                scale = math.cos(0.5 * (source_lat + tgt_lat))
+            return math.sqrt(delta_lat * delta_lat + delta_long * delta_long * scale * scale) * self.RAD_TO_DEGREE
          
         #  compute great circle distance
-        arange = math.cos(delta_lat) - (1.0 - math.cos(delta_long)) * math.cos(source_lat) * math.cos(tgt_lat)   
+        arange = math.cos(delta_lat) - (1.0 - math.cos(delta_long)) * cos_source * cos_tgt
     
         if (abs(arange) >= 1.0):
             arange = 0.0
@@ -172,7 +237,9 @@ class NavUtils(NavCommon):
         
         #  check if distance is under five miles;  if so, use a linear approximation
         if (arange < self.RAD_FIVE_MILES):
-            arange = math.sqrt(delta_lat * delta_lat + delta_long * delta_long * math.cos(source_lat) * math.cos(tgt_lat))
+            if NavStats.ENABLED:
+                NavStats.NAV_STATS.branch('GreatCircleRange.linear')
+            arange = math.sqrt(delta_lat * delta_lat + delta_long * delta_long * cos_source * cos_tgt)
     
         return arange * self.RAD_TO_DEGREE
     
@@ -195,6 +262,8 @@ class NavUtils(NavCommon):
         
         if (abs(init_lat) > self.LAT_TOLERANCE):
             # perform polar update using great circle equations */
+            if NavStats.ENABLED:
+                NavStats.NAV_STATS.branch('rhumb_line.greatCircle')
             cos_dist = math.cos(distance)
             sin_dist = math.sin(distance)
 
@@ -245,9 +314,10 @@ class NavUtils(NavCommon):
         """
         return 1.144 * (math.sqrt(eye_ht_ft) + math.sqrt(obj_ht_ft))
     
-    def CalculateBearing(self, theHeading, aStartPosition, anEndPosition, theBearingType):
+    def CalculateBearing(self, theHeading, aStartPosition, anEndPosition, theBearingType, mode = None):
         """
             Calculate the bearing from one geographic position to another one given the heading at the Start.
+            Raises LatitudeLimitError if either position is above or below 85 degrees latitude.
         """
         bearing = 0.0
         lat_error = 0.00005
@@ -257,15 +327,25 @@ class NavUtils(NavCommon):
         #  initialize bearings 
         abs_bearing = theHeading
         rel_bearing = theHeading
-        source_lat = self.toRadians(aStartPosition.getLatitude())
-        source_long = self.toRadians(aStartPosition.getLongitude())
-        target_lat = self.toRadians(anEndPosition.getLatitude())
-        target_long = self.toRadians(anEndPosition.getLongitude())
+        if isinstance(aStartPosition, PreparedPosition):
+            source_lat = aStartPosition.latRad
+            source_long = aStartPosition.lonRad
+        else:
+            source_lat = self.toRadians(aStartPosition.getLatitude())
+            source_long = self.toRadians(aStartPosition.getLongitude())
+        if isinstance(anEndPosition, PreparedPosition):
+            target_lat = anEndPosition.latRad
+            target_long = anEndPosition.lonRad
+        else:
+            target_lat = self.toRadians(anEndPosition.getLatitude())
+            target_long = self.toRadians(anEndPosition.getLongitude())
         source_heading = self.toRadians(theHeading)
         
         #  check if tracks are above 85 degrees latitude
         if (abs(source_lat) > self.RAD_85 or abs(target_lat) > self.RAD_85):
-            NavError("Track above or below 85 degrees latitude.")
+            if NavStats.ENABLED:
+                NavStats.NAV_STATS.branch('CalculateBearing.latitudeLimit')
+            raise LatitudeLimitError("Track above or below 85 degrees latitude.")
             
         else:
             #  calc change in latitude and longitude
@@ -278,8 +358,17 @@ class NavUtils(NavCommon):
             elif (del_long < -self.RAD_180):
                 del_long = del_long + self.RAD_360
 
-            # check for headings of +/- pi_over_2
-            if (abs(del_lat) < lat_error):
+            if mode is None:
+                mode = self.accuracyMode
+            if (mode is not EXACT_MODE):
+                # approximate modes: direction on a plane
+                if (mode is FLAT_EARTH_MODE):
+                    scale = math.cos(source_lat)
+                else:
+                    scale = math.cos(0.5 * (source_lat + target_lat))
+                abs_bearing = math.atan2(del_long * scale, del_lat)
+            elif (abs(del_lat) < lat_error):
+                # check for headings of +/- pi_over_2
                 if (del_long >= 0):
                     abs_bearing = self.RAD_90
                 else:
@@ -292,8 +381,11 @@ class NavUtils(NavCommon):
                         abs_bearing = self.RAD_180
                 else:
                     #  calculate the angle in radians
-                    t_term = math.tan(self.RAD_45 + target_lat / 2.0) / math.tan(self.RAD_45 + source_lat / 2.0)
-                    ln_term = math.log(t_term)
+                    if isinstance(aStartPosition, PreparedPosition) and isinstance(anEndPosition, PreparedPosition):
+                        ln_term = anEndPosition.meridional - aStartPosition.meridional
+                    else:
+                        t_term = math.tan(self.RAD_45 + target_lat / 2.0) / math.tan(self.RAD_45 + source_lat / 2.0)
+                        ln_term = math.log(t_term)
                     abs_bearing = math.atan(del_long / ln_term)
                     
             #  convert to the proper quadrant */
@@ -318,9 +410,30 @@ class NavUtils(NavCommon):
                 
         return bearing;
     
-    def CalculateAbsBearing(self, aStartPosition, anEndPosition):
+    def CalculateAbsBearing(self, aStartPosition, anEndPosition, mode = None):
         """ Calculate Absolute bearing irregardless of heading. """
-        return self.CalculateBearing(0.0, aStartPosition, anEndPosition, BearingType.ABSOLUTE)
+        return self.CalculateBearing(0.0, aStartPosition, anEndPosition, BearingType.ABSOLUTE, mode)
+
+    def approximatePosition(self, latitude, longitude, cos_lat, aCourse, aDistance, mode):
+        """
+            Dead reckoning on the plane of an approximate AccuracyMode from a start latitude and
+            longitude in radians and the cos of the latitude.  The course is held constant.
+        """
+        distance = self.toRadians(aDistance / self.NM_PER_DEGREE)
+        course = self.toRadians(aCourse)
+        delta_lat = distance * math.cos(course)
+        new_lat = latitude + delta_lat
+        if (abs(latitude) > self.LAT_TOLERANCE or abs(new_lat) > self.LAT_TOLERANCE):
+            return self.greatCircleTerms(latitude, longitude, math.sin(latitude), cos_lat, aCourse, aDistance)
+
+        if (mode is FLAT_EARTH_MODE):
+            scale = cos_lat
+        else:
+            scale = math.cos(latitude + 0.5 * delta_lat)
+        new_long = longitude + distance * math.sin(course) / scale
+        if (abs(new_long) >= self.RAD_180):
+            new_long -= self.RAD_360 * self.signum(new_long)
+        return GeographicPosition(self.toDegrees(new_lat), self.toDegrees(new_long))
             
     def CalculatePositionXY(self, aStartPosition, theChangeInX, theChangeInY):
         """
@@ -351,17 +464,19 @@ class NavUtils(NavCommon):
 
         return xy;
     
-    def CalculatePositionCS(self, aStartPosition, theSpeed, theHeading, theTimeInterval):
+    def CalculatePositionCS(self, aStartPosition, theSpeed, theHeading, theTimeInterval, mode = None):
         """
             Computes a new geographic position based on a heading, a speed, and a time interval 
             from a starting location.
         """
-        l_lat = aStartPosition.getLatitude()
-        l_long = aStartPosition.getLongitude()
-
         if (theSpeed > 0.0):
             l_distance = theSpeed * theTimeInterval
-            newPosition = self.GreatCircle(l_lat, l_long, theHeading, l_distance)
+            latitude, longitude, sin_lat, cos_lat = self.positionTerms(aStartPosition)
+            if mode is None:
+                mode = self.accuracyMode
+            if mode is not EXACT_MODE:
+                return self.approximatePosition(latitude, longitude, cos_lat, theHeading, l_distance, mode)
+            newPosition = self.greatCircleTerms(latitude, longitude, sin_lat, cos_lat, theHeading, l_distance)
         else:
             newPosition = aStartPosition
             
@@ -394,7 +509,7 @@ class NavUtils(NavCommon):
         target_sin = math.sin(target_course)
         target_cos = math.cos(target_course)
 
-        range_to_target = self. GreatCircleRange(theApproachPosition, theTargetPosition) * self.NM_PER_DEGREE
+        range_to_target = self.GreatCircleRange(theApproachPosition, theTargetPosition) * self.NM_PER_DEGREE
         approach_speed_x_rel = approach_speed_x * target_cos + approach_speed_y * target_sin - target_speed
         approach_speed_y_rel =  approach_speed_y * target_cos - approach_speed_x * target_sin
         
@@ -406,6 +521,8 @@ class NavUtils(NavCommon):
         
         if (rel_velocity < epsilon):
             code = CPA_State.NO_RELATIVE_MOTION
+            if NavStats.ENABLED:
+                NavStats.NAV_STATS.branch('CalculateCPA.NO_RELATIVE_MOTION')
         else:
             # Get approach heading in target's frame of reference  */
             if (abs(approach_speed_x_rel) <= epsilon):
@@ -430,6 +547,8 @@ class NavUtils(NavCommon):
 
         if (abs(approach_rb) >= self.PI_OVER_2):
             code = CPA_State.RECEDING
+            if NavStats.ENABLED:
+                NavStats.NAV_STATS.branch('CalculateCPA.RECEDING')
             
         # Load Output record
         output = CPAData()
@@ -473,36 +592,59 @@ class NavUtils(NavCommon):
         cpa = self.CalculateCPA(theCircleStartP, course, 60.0, theTargetPosition, 0.0, 0.0)
         return cpa.getRangeAtCPA()
     
+    def unitVectors(self, thePoints):
+        """ Return an N x 3 array of the unit vectors of a Track or a list of Points (or positions). """
+        if hasattr(thePoints, 'xyz'):
+            return thePoints.xyz()
+        import numpy as np
+        lat = self.PI_OVER_180 * np.array([p.getLatitude() for p in thePoints], dtype=np.float64)
+        lon = self.PI_OVER_180 * np.array([p.getLongitude() for p in thePoints], dtype=np.float64)
+        cos_lat = np.cos(lat)
+        return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
     def findMinimumDistanceIndices(self, startList, endList):
         """
             Find the indices of the points with minimum distance between two routes.
-            Input is 2 lists of Point representing the 2 routes.
-            Rather brute force, could possibly be optimised.
+            Input is 2 lists of Point (or 2 Tracks) representing the 2 routes.
+            The points' unit vectors are held in k-d trees so that only pairs that may be
+            the closest are compared.  As with a full scan, ties go to the lowest start
+            index and then the lowest end index.
+            The scan's law of cosines distance cannot tell apart separations below about
+            sqrt(machine epsilon) radians (they all come out near 0), so every pair that
+            close to the nearest one is re-scored with the same formula, giving exactly the
+            full scan's answer.
         """
+        from KDTree import KDTree
         indices = [-1, -1]
+        if len(startList) == 0 or len(endList) == 0:
+            return indices
+
+        startTree = KDTree(self.unitVectors(startList))
+        endTree = KDTree(self.unitVectors(endList))
+        closest = 2.0 * math.asin(min(1.0, startTree.closestDistance(endTree) / 2.0))
+        acos_floor = 4.0 * math.sqrt(sys.float_info.epsilon)
+        startIx, endIx = startTree.pairsWithin(endTree, math.sqrt(closest * closest + acos_floor * acos_floor) + 1.0e-9)
+
         minDistance = sys.float_info.max
-        for i in range(0, len(startList)):
+        for i, j in sorted(zip(startIx.tolist(), endIx.tolist())):
             cosLatS = math.cos(self.toRadians(startList[i].getLatitude()))
-            for j in range(0, len(endList)):
-                cosLatE = math.cos(self.toRadians(endList[j].getLatitude()))
-                deltaL  = math.cos(self.toRadians(startList[i].getLatitude() - endList[j].getLatitude()))
-                deltal  = math.cos(self.toRadians(startList[i].getLongitude() - endList[j].getLongitude()))
-                distance = math.acos(deltaL - (1.0 - deltal)*cosLatS*cosLatE)
-                if(distance < minDistance):
-                    indices[0] = i
-                    indices[1] = j
-                    minDistance = distance
+            cosLatE = math.cos(self.toRadians(endList[j].getLatitude()))
+            deltaL  = math.cos(self.toRadians(startList[i].getLatitude() - endList[j].getLatitude()))
+            deltal  = math.cos(self.toRadians(startList[i].getLongitude() - endList[j].getLongitude()))
+            distance = math.acos(max(-1.0, min(1.0, deltaL - (1.0 - deltal)*cosLatS*cosLatE)))
+            if(distance < minDistance):
+                indices[0] = i
+                indices[1] = j
+                minDistance = distance
         return indices
     
     def findMinimumDistanceLocation(self, startList, endList):
         """
         Find the two Points having the minimum distance between two routes.
-        Input is 2 lists of Point representing the 2 routes.
+        Input is 2 lists of Point (or 2 Tracks) representing the 2 routes.
         """
         ixes = self.findMinimumDistanceIndices(startList, endList)
-        positions = []
-        positions[0] = startList[ixes[0]]
-        positions[1] = endList[ixes[1]]
+        positions = [startList[ixes[0]], endList[ixes[1]]]
         return positions
     
     def NewPositionFraction(self, start, end, fraction):
@@ -511,16 +653,14 @@ class NavUtils(NavCommon):
             For example, if point 1 is at (0N, 1W) and point 2 is at (0N, 1E) a fraction of 0.5
             will result in a position (0N, 0W)
         """
+        start = self.prepare(start)
+        end = self.prepare(end)
         distance = self.toRadians(self.GreatCircleRange(start, end))
         a = math.sin(distance*(1.0 - fraction))/math.sin(distance)
         b = math.sin(distance * fraction)/math.sin(distance)
-        x = a*math.cos(self.toRadians(start.getLatitude())) * math.cos(self.toRadians(start.getLongitude())) \
-                      + b * math.cos(self.toRadians(end.getLatitude())) * math.cos(self.toRadians(end.getLongitude()))
-        y = a*math.cos(self.toRadians(start.getLatitude())) * math.sin(self.toRadians(start.getLongitude())) \
-                      + b * math.cos(self.toRadians(end.getLatitude())) * math.sin(self.toRadians(end.getLongitude()));
-        z = a*math.sin(self.toRadians(start.getLatitude())) + b * math.sin(self.toRadians(end.getLatitude()))
+        x = a * start.cosLat * start.cosLon + b * end.cosLat * end.cosLon
+        y = a * start.cosLat * start.sinLon + b * end.cosLat * end.sinLon
+        z = a * start.sinLat + b * end.sinLat
         latF = self.toDegrees(math.atan2(z, math.sqrt(x*x + y*y)))
         lonF = self.toDegrees(math.atan2(y,x))
         return GeographicPosition(latF, lonF)
-    
-    
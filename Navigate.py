@@ -8,6 +8,8 @@
  * @author JL Sowers May 2, 2023    Initial Code
  *
  *         JL Sowers May 26, 2023   Added background color to indicate Result fields
+ *         JL Sowers Oct 17, 2026   Computation errors arrive as NavException and
+ *                                  are shown here; only the GUI imports GTK
  ***************************************************************************** 
  *  DESIGN NOTES:
  *     Overiding the color without CSS caused a deprecate warning which
@@ -18,6 +20,7 @@ from GeographicPosition import GeographicPosition
 from NavUtils import NavUtils
 from NavCommon import NavCommon
 from NavError import NavError
+from NavException import NavException
 import warnings
 
 import gi
@@ -376,14 +379,17 @@ class Navigate(object):
         self.currentPage = name
         
     def process(self):       
-        if(self.currentPage == 'Bearing'):
-            self.processBearing()
-        elif (self.currentPage == 'CourseSpeed'):
-            self.processCourseSpeed()
-        elif (self.currentPage == 'CourseDistance'):
-            self.processCourseDistance()
-        elif (self.currentPage == 'CPA'):
-            self.processCPA()
+        try:
+            if(self.currentPage == 'Bearing'):
+                self.processBearing()
+            elif (self.currentPage == 'CourseSpeed'):
+                self.processCourseSpeed()
+            elif (self.currentPage == 'CourseDistance'):
+                self.processCourseDistance()
+            elif (self.currentPage == 'CPA'):
+                self.processCPA()
+        except NavException as err:
+            NavError(str(err))
         
     def toDecimal(self):
         """
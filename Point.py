@@ -7,30 +7,145 @@
  * @author JL Sowers Apr 28, 2023
  ***************************************************************************** 
  *  DESIGN NOTES:
- *  
+ *      The geographic (lat, lon) and Cartesian (x, y, z) forms are computed
+ *      lazily from whichever one the Point was built with.  Setting a
+ *      coordinate of one form clears the other, which is recomputed from
+ *      it when next read.
  ***************************************************************************** 
 '''
 import math
 
 class Point():
+    __slots__ = ('_lat', '_lon', '_x', '_y', '_z')
+    RADIUS = 10.0
     
     def __init__(self, *args):
-        self.RADIUS = 10.0       
+        """
+            Point(lat, lon) or Point(x, y, z).  The other form is only computed (and then
+            cached) when one of its coordinates is first read.
+        """
+        self._lat = self._lon = None
+        self._x = self._y = self._z = None
         if len(args) == 2:
-            self.lat = args[0]
-            self.lon = args[1]
-
-            self.x = self.RADIUS
-            self.x *= math.cos(self.toRadians(self.lon)) * math.cos(self.toRadians(self.lat))
-            self.y = self.RADIUS
-            self.y *= math.sin(self.toRadians(self.lon)) * math.cos(self.toRadians(self.lat))
-            self.z = self.RADIUS * math.sin(self.toRadians(self.lat))
+            self._lat = args[0]
+            self._lon = args[1]
         elif len(args) == 3:
-            self.x = args[0]
-            self.y = args[1]
-            self.z = args[2]
-            self.lat = self.toDegrees(math.asin(self.z / self.RADIUS))
-            self.lon = self.toDegrees(math.atan2(self.y, self.x));
+            self._x = args[0]
+            self._y = args[1]
+            self._z = args[2]
+
+    @staticmethod
+    def fromArrays(theLatitudes, theLongitudes):
+        """ Build a list of Points from sequences (or NumPy arrays) of latitudes and longitudes. """
+        if hasattr(theLatitudes, 'tolist'):
+            theLatitudes = theLatitudes.tolist()
+        if hasattr(theLongitudes, 'tolist'):
+            theLongitudes = theLongitudes.tolist()
+        new = Point.__new__
+        points = []
+        for lat, lon in zip(theLatitudes, theLongitudes):
+            p = new(Point)
+            p._lat = lat
+            p._lon = lon
+            p._x = p._y = p._z = None
+            points.append(p)
+        return points
+
+    @staticmethod
+    def fromCartesianArrays(theXs, theYs, theZs):
+        """ Build a list of Points from sequences (or NumPy arrays) of x, y and z. """
+        if hasattr(theXs, 'tolist'):
+            theXs, theYs, theZs = theXs.tolist(), theYs.tolist(), theZs.tolist()
+        new = Point.__new__
+        points = []
+        for x, y, z in zip(theXs, theYs, theZs):
+            p = new(Point)
+            p._x = x
+            p._y = y
+            p._z = z
+            p._lat = p._lon = None
+            points.append(p)
+        return points
+
+    def computeCartesian(self):
+        if self._lat is None:
+            return
+        self._x = self.RADIUS
+        self._x *= math.cos(self.toRadians(self._lon)) * math.cos(self.toRadians(self._lat))
+        self._y = self.RADIUS
+        self._y *= math.sin(self.toRadians(self._lon)) * math.cos(self.toRadians(self._lat))
+        self._z = self.RADIUS * math.sin(self.toRadians(self._lat))
+
+    def computeGeographic(self):
+        if self._x is None:
+            return
+        self._lat = self.toDegrees(math.asin(self._z / self.RADIUS))
+        self._lon = self.toDegrees(math.atan2(self._y, self._x));
+
+    @property
+    def lat(self):
+        if self._lat is None:
+            self.computeGeographic()
+        return self._lat
+
+    @lat.setter
+    def lat(self, alat):
+        if self._lon is None:
+            self.computeGeographic()
+        self._lat = alat
+        self._x = self._y = self._z = None
+
+    @property
+    def lon(self):
+        if self._lon is None:
+            self.computeGeographic()
+        return self._lon
+
+    @lon.setter
+    def lon(self, alon):
+        if self._lat is None:
+            self.computeGeographic()
+        self._lon = alon
+        self._x = self._y = self._z = None
+
+    @property
+    def x(self):
+        if self._x is None:
+            self.computeCartesian()
+        return self._x
+
+    @x.setter
+    def x(self, ax):
+        if self._x is None:
+            self.computeCartesian()
+        self._x = ax
+        self._lat = self._lon = None
+
+    @property
+    def y(self):
+        if self._y is None:
+            self.computeCartesian()
+        return self._y
+
+    @y.setter
+    def y(self, ay):
+        if self._y is None:
+            self.computeCartesian()
+        self._y = ay
+        self._lat = self._lon = None
+
+    @property
+    def z(self):
+        if self._z is None:
+            self.computeCartesian()
+        return self._z
+
+    @z.setter
+    def z(self, az):
+        if self._z is None:
+            self.computeCartesian()
+        self._z = az
+        self._lat = self._lon = None
         
     def toRadians(self, deg):
         return math.pi * deg / 180.0
@@ -64,12 +179,25 @@ class Point():
             res = ((self.lat == other.lat) and (self.lon == other.lon)) or (self.lat == 90.0 and other.lat == 90.0) or (self.lat == -90.0 and other.lat == -90.0)
             return res
         return NotImplemented
+
+    def __hash__(self):
+        """
+            Consistent with __eq__: points at the same pole hash alike whatever their
+            longitude.  A point used as a dict key or set member must not be changed.
+        """
+        if self.lat == 90.0 or self.lat == -90.0:
+            return hash(self.lat)
+        return hash((self.lat, self.lon))
     
     def getLatitude(self):
-        return self.lat
+        if self._lat is None:
+            self.computeGeographic()
+        return self._lat
     
     def getLongitude(self):
-        return self.lon
+        if self._lon is None:
+            self.computeGeographic()
+        return self._lon
     
     def setLatitude(self, alat):
         self.lat= alat
@@ -0,0 +1,50 @@
+'''
+ ***************************************************************************** 
+ * PURPOSE
+ *     A geographic position with its trigonometric terms computed once
+ ***************************************************************************** 
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ ***************************************************************************** 
+ *  DESIGN NOTES:
+ *      For fixed reference points (ports, buoys, own ship for one update)
+ *      that are used in many NavUtils calls.  The radians, sin/cos of the
+ *      latitude and longitude and the Mercator meridional term
+ *      log(tan(45 + lat/2)) are computed when the position is set.
+ *      NavUtils uses them whenever it is handed a PreparedPosition.
+ ***************************************************************************** 
+'''
+import math
+from NavCommon import NavCommon
+from GeographicPosition import GeographicPosition
+
+class PreparedPosition(GeographicPosition):
+    __slots__ = ('latRad', 'lonRad', 'sinLat', 'cosLat', 'sinLon', 'cosLon', 'meridional')
+
+    def __init__(self, *args):
+        if len(args) == 1:
+            GeographicPosition.__init__(self, args[0].getLatitude(), args[0].getLongitude())
+        else:
+            GeographicPosition.__init__(self, *args)
+        self.prepare()
+
+    def prepare(self):
+        """ Compute the cached terms from the latitude and longitude. """
+        self.latRad = NavCommon.PI_OVER_180 * self.latitude
+        self.lonRad = NavCommon.PI_OVER_180 * self.longitude
+        self.sinLat = math.sin(self.latRad)
+        self.cosLat = math.cos(self.latRad)
+        self.sinLon = math.sin(self.lonRad)
+        self.cosLon = math.cos(self.lonRad)
+        if abs(self.latRad) < NavCommon.PI_OVER_2:
+            self.meridional = math.log(math.tan(NavCommon.RAD_45 + self.latRad / 2.0))
+        else:
+            self.meridional = math.copysign(math.inf, self.latRad)
+
+    def setLatitude(self, newlat):
+        self.latitude = newlat
+        self.prepare()
+
+    def setLongitude(self, newlon):
+        self.longitude = newlon
+        self.prepare()
@@ -0,0 +1,174 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     A polyline route with a spatial index over its legs
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Each great circle leg is bounded by a ball in 3-D: centred on the
+ *      leg's midpoint (on the unit sphere) with the chord to its ends as
+ *      the radius, which encloses the whole arc.  The balls are indexed in
+ *      a KDTree whose node boxes enclose them.  A query builds a KDTree of
+ *      the positions and walks both trees together; a node pair is pruned
+ *      when its box distance exceeds the worst nearest-leg distance found
+ *      so far for the positions of the query node.  Exact distances to the
+ *      leg segments are computed a leaf pair at a time, so a query costs
+ *      O(log L) per position instead of a pass over all L legs.
+ *      The cross-track and along-track results come from
+ *      NavBatch.CrossTrackDistance on the chosen legs, so they match
+ *      NavBatch.routeCrossTrack; a position equally near two legs (e.g.
+ *      beyond a shared waypoint) is given the lower leg index by both,
+ *      distances within LEG_TIE_ANGLE (the acos rounding floor) counting
+ *      as equal.
+ *      latitudes() and longitudes() return the waypoints, as for a Track,
+ *      so a Route can itself be passed to routeCrossTrack or densifyRoute.
+ *****************************************************************************
+'''
+import numpy as np
+from NavBatch import NavBatch
+from KDTree import KDTree
+from NavException import AntipodalError
+
+class Route(NavBatch):
+
+    def __init__(self, theWaypoints, leafSize = 32, queryLeafSize = 256):
+        """
+            Build the route from its waypoints: a Track, an N x 2 array of [lat, lon] rows
+            or a list of Points.  leafSize legs and queryLeafSize query positions are
+            compared at a time.
+        """
+        if len(theWaypoints) > 0 and hasattr(theWaypoints[0], 'getLatitude') and not hasattr(theWaypoints, 'latitudes'):
+            theWaypoints = [[p.getLatitude(), p.getLongitude()] for p in theWaypoints]
+        lat, lon = self.positionArrays(theWaypoints)
+        self.waypointLatitudes = np.array(np.ravel(lat), dtype=np.float64)
+        self.waypointLongitudes = np.array(np.ravel(lon), dtype=np.float64)
+        if len(self.waypointLatitudes) < 2:
+            raise ValueError("A route needs at least two waypoints")
+        self.queryLeafSize = queryLeafSize
+
+        xyz = np.column_stack(self.unitVectorArrays(self.waypointLatitudes, self.waypointLongitudes))
+        self.start = xyz[:-1]
+        self.end = xyz[1:]
+        if np.any(np.einsum('ij,ij->i', self.start, self.end) <= self.ANTIPODAL_DOT):
+            raise AntipodalError("Great circle leg between antipodal positions is undefined.")
+
+        # Pole of each leg's great circle and the direction of travel at its start
+        pole = np.cross(self.start, self.end)
+        norm = np.linalg.norm(pole, axis=1)
+        self.zeroLength = norm == 0.0
+        self.pole = pole / np.where(self.zeroLength, 1.0, norm)[:, None]
+        self.tangent = np.cross(self.pole, self.start)
+        self.legAngle = np.arctan2(norm, np.einsum('ij,ij->i', self.start, self.end))
+
+        self.legLength = self.legAngle * self.RAD_TO_DEGREE * self.NM_PER_DEGREE
+        self.legOffset = np.concatenate(([0.0], np.cumsum(self.legLength)[:-1]))
+
+        # Bounding ball of each leg
+        middle = self.start + self.end
+        middle_norm = np.linalg.norm(middle, axis=1)
+        centre = middle / middle_norm[:, None]
+        radius = np.linalg.norm(self.start - centre, axis=1)
+        self.tree = KDTree(centre, leafSize, radius)
+
+    def latitudes(self):
+        """ Latitudes of the waypoints, so a Route can be passed wherever a Track is. """
+        return self.waypointLatitudes
+
+    def longitudes(self):
+        return self.waypointLongitudes
+
+    def legCount(self):
+        return len(self.legLength)
+
+    def length(self):
+        """ Total length of the route (NM). """
+        return float(self.legLength.sum())
+
+    def segmentAngles(self, thePoints, theLegs):
+        """ Angular distances (radians) from unit vectors thePoints to the leg segments theLegs. """
+        a = self.start[theLegs]
+        b = self.end[theLegs]
+        dot_a = thePoints @ a.T
+        dot_b = thePoints @ b.T
+        along = np.arctan2(thePoints @ self.tangent[theLegs].T, dot_a)
+        cross = np.abs(np.arcsin(np.clip(thePoints @ self.pole[theLegs].T, -1.0, 1.0)))
+        on_leg = (along >= 0.0) & (along <= self.legAngle[theLegs]) & ~self.zeroLength[theLegs]
+        to_a = np.arccos(np.clip(dot_a, -1.0, 1.0))
+        to_b = np.arccos(np.clip(dot_b, -1.0, 1.0))
+        return np.where(on_leg, cross, np.minimum(to_a, to_b))
+
+    def nearestLegs(self, theLatitudes, theLongitudes):
+        """ Return [leg, angle], the nearest leg of each position and its distance (radians). """
+        points = np.column_stack(self.unitVectorArrays(theLatitudes, theLongitudes))
+        queries = KDTree(points, self.queryLeafSize)
+        best = np.full(len(points), np.inf)         # In the query tree's order
+        best_leg = np.zeros(len(points), dtype=np.int64)
+        tree = self.tree
+
+        def bound(node, queryNode):
+            worst = best[queries.start[queryNode]:queries.stop[queryNode]].max() + self.LEG_TIE_ANGLE
+            return 2.0 * np.sin(min(worst, np.pi) / 2.0)   # As a chord, like the box distance
+
+        def visit(node, queryNode):
+            q0 = queries.start[queryNode]
+            q1 = queries.stop[queryNode]
+            legs = tree.indices[tree.start[node]:tree.stop[node]]
+            angles = self.segmentAngles(queries.data[q0:q1], legs)
+            distance = angles.min(axis=1)
+            # Lowest leg index among the equally near, whatever order the leaves are visited in
+            tied = angles <= distance[:, None] + self.LEG_TIE_ANGLE
+            nearest = np.where(tied, legs, np.iinfo(np.int64).max).min(axis=1)
+            better = distance < best[q0:q1] - self.LEG_TIE_ANGLE
+            equal = ~better & (distance <= best[q0:q1] + self.LEG_TIE_ANGLE)
+            best_leg[q0:q1] = np.where(better, nearest,
+                                       np.where(equal, np.minimum(nearest, best_leg[q0:q1]), best_leg[q0:q1]))
+            best[q0:q1] = np.minimum(distance, best[q0:q1])
+
+        tree.dualTraverse(queries, bound, visit)
+        leg = np.empty(len(points), dtype=np.int64)
+        angle = np.empty(len(points))
+        leg[queries.indices] = best_leg
+        angle[queries.indices] = best
+        return [leg, angle]
+
+    def nearestLeg(self, *args):
+        """
+            Find the nearest leg to each position.  Returns [leg, distance], the leg index and
+            the distance (NM) to the leg segment.
+
+            nearestLeg(positions) or nearestLeg(lats, lons)
+        """
+        lat, lon = self.positionArrays(*args)
+        shape = np.shape(lat)
+        leg, angle = self.nearestLegs(np.ravel(lat), np.ravel(lon))
+        distance = angle * self.RAD_TO_DEGREE * self.NM_PER_DEGREE
+        return [leg.reshape(shape), distance.reshape(shape)]
+
+    def crossTrack(self, *args):
+        """
+            Cross-track and along-track distances (NM) from the nearest leg.  Returns
+            [crossTrack, alongTrack, leg] as NavBatch.routeCrossTrack does: crossTrack is
+            positive to the right of the route and alongTrack runs from the first waypoint.
+
+            crossTrack(positions) or crossTrack(lats, lons)
+        """
+        lat, lon = self.positionArrays(*args)
+        shape = np.shape(lat)
+        lat = np.ravel(lat)
+        lon = np.ravel(lon)
+        leg = self.nearestLegs(lat, lon)[0]
+        cross_track, along_track = self.CrossTrackDistance(lat, lon,
+                                                           self.waypointLatitudes[leg], self.waypointLongitudes[leg],
+                                                           self.waypointLatitudes[leg + 1], self.waypointLongitudes[leg + 1])
+        along_track = self.legOffset[leg] + along_track
+        return [cross_track.reshape(shape), along_track.reshape(shape), leg.reshape(shape)]
+
+
+if __name__ == '__main__':
+    route = Route([[36.85, -76.29], [36.9, -75.5], [40.0, -60.0], [49.9, -6.0], [50.9, -1.4]])
+    print("Route of " + str(route.legCount()) + " legs, " + str(route.length()) + " NM")
+    print(route.crossTrack([[38.0, -68.0], [50.5, -3.0]]))
+    print(route.nearestLeg(45.0, -30.0))
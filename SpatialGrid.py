@@ -0,0 +1,146 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Bucket geographic positions into lat/lon cells for neighbour searches
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Rows are bands of latitude one cell size tall.  Each row gets its own
+ *      number of longitude columns, chosen so that two points within one cell
+ *      size of each other always fall in the same or adjacent cells:
+ *          hav(d) >= cos(lat1) cos(lat2) hav(dlon)
+ *      bounds the longitude difference using the most poleward latitude of
+ *      the row and its neighbours.  Rows that touch the poles collapse to a
+ *      single cell.  Columns wrap around the antimeridian.
+ *      Cells are at least MIN_CELL_SIZE on a side; a larger cell only adds
+ *      candidates, so a zero cell size (e.g. a stationary fleet screened
+ *      with no alert range) still finds every pair.
+ *****************************************************************************
+'''
+import math
+import numpy as np
+from NavCommon import NavCommon
+
+class SpatialGrid(NavCommon):
+    # Smallest cell (NM); smaller cells would only multiply the rows and columns
+    MIN_CELL_SIZE = 0.1
+
+    def __init__(self, theLatitudes, theLongitudes, theCellSize):
+        """
+            Index the positions (degrees) into cells theCellSize (NM) on a side, or
+            MIN_CELL_SIZE if that is larger.
+        """
+        self.latitudes = np.asarray(theLatitudes, dtype=np.float64)
+        self.longitudes = np.asarray(theLongitudes, dtype=np.float64)
+        cell_size = float(theCellSize)
+        self.cellSize = cell_size if cell_size >= self.MIN_CELL_SIZE else self.MIN_CELL_SIZE
+
+        cell_deg = self.cellSize / self.NM_PER_DEGREE
+        self.rowHeight = min(cell_deg, 180.0)
+        self.numberRows = max(1, int(math.ceil(180.0 / self.rowHeight)))
+
+        # Longitude columns per row, from the haversine bound over the row and its neighbours
+        half_dist = math.sin(self.toRadians(min(cell_deg, 180.0)) / 2.0)
+        rows = np.arange(self.numberRows)
+        south = -90.0 + (rows - 1) * self.rowHeight
+        north = -90.0 + (rows + 2) * self.rowHeight
+        edge = np.minimum(90.0, np.maximum(np.abs(south), np.abs(north)))
+        cos_edge = np.cos(self.toRadians(edge))
+        split = (cos_edge > 0.0) & (half_dist < cos_edge)
+        bound = self.toDegrees(2.0 * np.arcsin(np.where(split, half_dist / np.where(split, cos_edge, 1.0), 0.0)))
+        columns = np.floor_divide(360.0, np.where(split, bound, 360.0))
+        self.numberColumns = np.maximum(1, columns).astype(np.int64)
+        self.columnWidth = 360.0 / self.numberColumns
+        self.rowOffset = np.concatenate(([0], np.cumsum(self.numberColumns)))
+
+        # Sort the points by cell so that each cell is a contiguous slice
+        self.cells = self.cellOf(self.latitudes, self.longitudes)
+        self.order = np.argsort(self.cells, kind='stable')
+        sorted_cells = self.cells[self.order]
+        self.occupied, self.cellStart, counts = np.unique(sorted_cells, return_index=True, return_counts=True)
+        self.cellStop = self.cellStart + counts
+
+    def rowOf(self, theLatitudes):
+        rows = np.floor((np.asarray(theLatitudes, dtype=np.float64) + 90.0) / self.rowHeight).astype(np.int64)
+        return np.clip(rows, 0, self.numberRows - 1)
+
+    def columnOf(self, theRows, theLongitudes):
+        lon = np.mod(np.asarray(theLongitudes, dtype=np.float64), 360.0)
+        cols = np.floor(lon / self.columnWidth[theRows]).astype(np.int64)
+        return np.minimum(cols, self.numberColumns[theRows] - 1)
+
+    def cellOf(self, theLatitudes, theLongitudes):
+        """ Return the cell number of each position. """
+        rows = self.rowOf(theLatitudes)
+        return self.rowOffset[rows] + self.columnOf(rows, theLongitudes)
+
+    def neighbourCells(self, theCell):
+        """ Return the cell numbers of a cell and of all cells adjacent to it. """
+        row = int(np.searchsorted(self.rowOffset, theCell, side='right') - 1)
+        col = theCell - self.rowOffset[row]
+        west = (col - 1) * self.columnWidth[row]
+        east = (col + 2) * self.columnWidth[row]
+        cells = []
+        for nrow in range(max(0, row - 1), min(self.numberRows, row + 2)):
+            ncols = int(self.numberColumns[nrow])
+            first = int(math.floor(west / self.columnWidth[nrow]))
+            last = int(math.floor(east / self.columnWidth[nrow]))
+            if last - first + 1 >= ncols:
+                cols = np.arange(ncols)
+            else:
+                cols = np.mod(np.arange(first, last + 1), ncols)
+            cells.append(self.rowOffset[nrow] + cols)
+        return np.unique(np.concatenate(cells))
+
+    def pointsIn(self, theCells):
+        """ Return the indices of the indexed points lying in any of the cells. """
+        slots = np.searchsorted(self.occupied, theCells)
+        inside = slots < len(self.occupied)
+        slots = slots[inside]
+        slots = slots[self.occupied[slots] == theCells[inside]]
+        if len(slots) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.order[self.cellStart[s]:self.cellStop[s]] for s in slots])
+
+    def queryPairs(self, theLatitudes, theLongitudes):
+        """
+            Return [queryIx, pointIx], every pairing of a query position with an indexed
+            position in the same or an adjacent cell.  All pairs closer than the cell size
+            are included.
+        """
+        cells = self.cellOf(theLatitudes, theLongitudes)
+        order = np.argsort(cells, kind='stable')
+        query_cells, starts, counts = np.unique(cells[order], return_index=True, return_counts=True)
+
+        query_ix = []
+        point_ix = []
+        for cell, start, count in zip(query_cells, starts, counts):
+            points = self.pointsIn(self.neighbourCells(cell))
+            if len(points) == 0:
+                continue
+            queries = order[start:start + count]
+            query_ix.append(np.repeat(queries, len(points)))
+            point_ix.append(np.tile(points, len(queries)))
+        if len(query_ix) == 0:
+            return [np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)]
+        return [np.concatenate(query_ix), np.concatenate(point_ix)]
+
+    def pairs(self):
+        """
+            Return [firstIx, secondIx], the distinct pairs (first < second) of indexed
+            positions in the same or adjacent cells, sorted by first then second.
+        """
+        first, second = self.queryPairs(self.latitudes, self.longitudes)
+        keep = first < second
+        first = first[keep]
+        second = second[keep]
+        order = np.lexsort((second, first))
+        return [first[order], second[order]]
+
+
+if __name__ == '__main__':
+    grid = SpatialGrid([10.0, 10.1, 45.0, 89.9, 89.9, 0.0], [179.95, -179.95, 0.0, 0.0, 180.0, 90.0], 30.0)
+    print("Candidate pairs: " + str(grid.pairs()))
@@ -0,0 +1,150 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     A compact track (or route) of latitude/longitude fixes
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      The fixes are stored as a structure of arrays: contiguous float64
+ *      latitude and longitude columns (16 bytes per fix) that grow by
+ *      doubling.  Slicing returns a Track sharing the same memory; indexing
+ *      and iteration return TrackFix views that behave like a Point for
+ *      reading (getLatitude/getLongitude), so a Track can be passed where a
+ *      list of Point is expected.  Unit vectors (x, y, z) are computed on
+ *      demand and cached.
+ *****************************************************************************
+'''
+import numpy as np
+from Point import Point
+
+class TrackFix(object):
+    """ A lightweight read-only view of one fix of a Track. """
+    __slots__ = ('track', 'index')
+
+    def __init__(self, track, index):
+        self.track = track
+        self.index = index
+
+    def getLatitude(self):
+        return float(self.track.lat[self.index])
+
+    def getLongitude(self):
+        return float(self.track.lon[self.index])
+
+    def toPoint(self):
+        return Point(self.getLatitude(), self.getLongitude())
+
+    def toString(self):
+        return "lat=" + str(self.getLatitude()) + ", lon=" + str(self.getLongitude())
+
+
+class Track(object):
+
+    def __init__(self, theLatitudes = (), theLongitudes = (), capacity = 0):
+        lats = np.asarray(theLatitudes, dtype=np.float64).ravel()
+        lons = np.asarray(theLongitudes, dtype=np.float64).ravel()
+        if len(lats) != len(lons):
+            raise ValueError("Latitude and longitude arrays must have the same length")
+        self.size = len(lats)
+        if capacity > self.size:
+            self.lat = np.empty(capacity, dtype=np.float64)
+            self.lon = np.empty(capacity, dtype=np.float64)
+            self.lat[:self.size] = lats
+            self.lon[:self.size] = lons
+        else:
+            self.lat = lats
+            self.lon = lons
+        self.unitXYZ = None
+
+    @staticmethod
+    def fromPoints(thePoints):
+        """ Build a Track from a list of Points (or anything with getLatitude/getLongitude). """
+        lats = np.fromiter((p.getLatitude() for p in thePoints), dtype=np.float64)
+        lons = np.fromiter((p.getLongitude() for p in thePoints), dtype=np.float64)
+        return Track(lats, lons)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.size)
+            return Track(self.lat[start:stop:step], self.lon[start:stop:step])
+        if key < 0:
+            key += self.size
+        if key < 0 or key >= self.size:
+            raise IndexError("Track index out of range")
+        return TrackFix(self, key)
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield TrackFix(self, i)
+
+    def latitudes(self):
+        """ The latitude column (a view, not a copy). """
+        return self.lat[:self.size]
+
+    def longitudes(self):
+        """ The longitude column (a view, not a copy). """
+        return self.lon[:self.size]
+
+    def grow(self, theSize):
+        """ Make room for theSize fixes, doubling the storage as needed. """
+        if theSize <= len(self.lat) and self.lat.flags.owndata:
+            return
+        capacity = max(theSize, 2 * len(self.lat), 16)
+        lat = np.empty(capacity, dtype=np.float64)
+        lon = np.empty(capacity, dtype=np.float64)
+        lat[:self.size] = self.lat[:self.size]
+        lon[:self.size] = self.lon[:self.size]
+        self.lat = lat
+        self.lon = lon
+
+    def append(self, theLatitude, theLongitude):
+        """ Add one fix to the end of the track. """
+        self.grow(self.size + 1)
+        self.lat[self.size] = theLatitude
+        self.lon[self.size] = theLongitude
+        self.size += 1
+
+    def extend(self, theLatitudes, theLongitudes):
+        """ Add arrays of fixes to the end of the track. """
+        lats = np.asarray(theLatitudes, dtype=np.float64).ravel()
+        lons = np.asarray(theLongitudes, dtype=np.float64).ravel()
+        if len(lats) != len(lons):
+            raise ValueError("Latitude and longitude arrays must have the same length")
+        self.grow(self.size + len(lats))
+        self.lat[self.size:self.size + len(lats)] = lats
+        self.lon[self.size:self.size + len(lons)] = lons
+        self.size += len(lats)
+
+    def xyz(self):
+        """ Return the N x 3 unit vectors of the fixes, computing only those not yet cached. """
+        done = 0 if self.unitXYZ is None else len(self.unitXYZ)
+        if done < self.size:
+            lat = np.radians(self.lat[done:self.size])
+            lon = np.radians(self.lon[done:self.size])
+            cos_lat = np.cos(lat)
+            new = np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+            self.unitXYZ = new if done == 0 else np.concatenate((self.unitXYZ, new))
+        return self.unitXYZ[:self.size]
+
+    def toPoints(self):
+        """ Return the fixes as a list of Points. """
+        return Point.fromArrays(self.latitudes(), self.longitudes())
+
+    def toString(self):
+        return "Track of " + str(self.size) + " fixes"
+
+
+if __name__ == '__main__':
+    track = Track([10.0, 10.5], [-20.0, -20.5])
+    track.append(11.0, -21.0)
+    track.extend([11.5, 12.0], [-21.5, -22.0])
+    print(track.toString())
+    for fix in track[1:4]:
+        print(fix.toString())
+    print(track.xyz())
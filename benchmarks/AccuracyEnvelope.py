@@ -0,0 +1,95 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Worst-case error envelope of the AccuracyModes
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      For each start latitude and distance, every course (in COURSE_STEP
+ *      degree steps) is sailed along the great circle to an end position,
+ *      and each mode of NavBatch is compared with references computed here
+ *      independently of the code under test:
+ *          range            haversine great circle distance
+ *          bearing          Mercator (rhumb line) bearing, as CalculateBearing
+ *          dead reckoning   great circle destination
+ *      Range and dead reckoning errors are given as a percentage of the
+ *      distance, bearing errors in degrees; each is the worst over all
+ *      courses and both hemispheres.  Prints Markdown tables:
+ *          python benchmarks/AccuracyEnvelope.py
+ *****************************************************************************
+'''
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from NavBatch import NavBatch
+from NavUtils import AccuracyMode
+
+LATITUDES = [0.0, 30.0, 45.0, 60.0, 70.0, 80.0, 84.0]
+DISTANCES = [0.1, 1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0]
+COURSE_STEP = 0.5
+
+def destination(theLatitudes, theCourses, theDistance):
+    """ Great circle destination [lat, lon] (degrees) from longitude 0. """
+    lat = np.radians(theLatitudes)
+    course = np.radians(theCourses)
+    arc = np.radians(theDistance / 60.0)
+    end_lat = np.arcsin(np.sin(lat) * np.cos(arc) + np.cos(lat) * np.sin(arc) * np.cos(course))
+    end_lon = np.arctan2(np.sin(course) * np.sin(arc) * np.cos(lat), np.cos(arc) - np.sin(lat) * np.sin(end_lat))
+    return [np.degrees(end_lat), np.degrees(end_lon)]
+
+def haversine(lat1, lon1, lat2, lon2):
+    """ Great circle distance (NM). """
+    lat1, lon1, lat2, lon2 = [np.radians(a) for a in (lat1, lon1, lat2, lon2)]
+    h = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    return 60.0 * np.degrees(2.0 * np.arcsin(np.sqrt(h)))
+
+def rhumbBearing(lat1, lon1, lat2, lon2):
+    """ Mercator bearing (degrees). """
+    mercator = np.log(np.tan(np.pi / 4.0 + np.radians(lat2) / 2.0) / np.tan(np.pi / 4.0 + np.radians(lat1) / 2.0))
+    return np.degrees(np.arctan2(np.radians(lon2 - lon1), mercator))
+
+def envelope(theBatch, theMode, theLatitude, theDistance):
+    """ Return the worst [range %, bearing degrees, dead reckoning %] of theMode at one latitude and distance. """
+    courses = np.arange(0.0, 360.0, COURSE_STEP)
+    lat = np.concatenate((np.full(len(courses), theLatitude), np.full(len(courses), -theLatitude)))
+    courses = np.concatenate((courses, courses))
+    lon = np.zeros(len(lat))
+    end_lat, end_lon = destination(lat, courses, theDistance)
+
+    arange = 60.0 * theBatch.GreatCircleRange(lat, lon, end_lat, end_lon, mode=theMode)
+    range_error = 100.0 * np.max(np.abs(arange - haversine(lat, lon, end_lat, end_lon))) / theDistance
+
+    bearing = theBatch.CalculateAbsBearing(lat, lon, end_lat, end_lon, mode=theMode)[0]
+    difference = (bearing - rhumbBearing(lat, lon, end_lat, end_lon) + 180.0) % 360.0 - 180.0
+    bearing_error = np.nanmax(np.abs(difference)) if np.any(~np.isnan(difference)) else np.nan
+
+    dr_lat, dr_lon = theBatch.GreatCircle(lat, lon, courses, np.full(len(lat), theDistance), mode=theMode)[:2]
+    dr_error = 100.0 * np.max(haversine(dr_lat, dr_lon, end_lat, end_lon)) / theDistance
+    return [range_error, bearing_error, dr_error]
+
+def main():
+    batch = NavBatch()
+    results = {}
+    for mode in AccuracyMode:
+        for latitude in LATITUDES:
+            for distance in DISTANCES:
+                results[(mode, latitude, distance)] = envelope(batch, mode, latitude, distance)
+
+    titles = ["Range error (% of distance)", "Bearing error (degrees)", "Dead reckoning error (% of distance)"]
+    for ix, title in enumerate(titles):
+        print("\n" + title + ": EXACT / EQUIRECTANGULAR / FLAT_EARTH\n")
+        print("| NM \\ lat | " + " | ".join("%g" % lat for lat in LATITUDES) + " |")
+        print("|---" * (len(LATITUDES) + 1) + "|")
+        for distance in DISTANCES:
+            cells = [" / ".join("%.2g" % results[(mode, lat, distance)][ix] for mode in AccuracyMode)
+                     for lat in LATITUDES]
+            print("| %g | " % distance + " | ".join(cells) + " |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Benchmark of the convex hull routines
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Times orderByAngle + grahamScan (O(n^2)) against the monotone chain
+ *      convexHull and convexHullIndices on random AIS-like fixes.
+ *          python benchmarks/HullBench.py [sizes...]
+ *      The O(n^2) path is skipped above OLD_PATH_LIMIT points.
+ *****************************************************************************
+'''
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Geometry import Geometry
+from Point import Point
+
+OLD_PATH_LIMIT = 20000
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return [time.perf_counter() - start, result]
+
+def main(sizes):
+    geometry = Geometry()
+    rng = np.random.default_rng(14)
+    print("%10s %16s %16s %16s %6s" % ("points", "graham (s)", "convexHull (s)", "indices (s)", "hull"))
+    for size in sizes:
+        lats = rng.normal(36.0, 0.5, size)
+        lons = rng.normal(-75.0, 0.5, size)
+        points = Point.fromArrays(lats, lons)
+        if size <= OLD_PATH_LIMIT:
+            old_time = timed(lambda p: geometry.grahamScan(geometry.orderByAngle(p)), points)[0]
+            old = "%16.4f" % old_time
+        else:
+            old = "%16s" % "skipped"
+        hull_time, hull = timed(geometry.convexHull, points)
+        index_time = timed(geometry.convexHullIndices, lats, lons)[0]
+        print("%10d %s %16.4f %16.4f %6d" % (size, old, hull_time, index_time, len(hull)))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000, 1000000])
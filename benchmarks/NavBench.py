@@ -0,0 +1,278 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Benchmark suite for the NavUtils, NavBatch and Geometry entry points
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Times every case over each input size in four geographic regimes
+ *      (equatorial, high-latitude, antimeridian and polar) and writes the
+ *      results to a JSON file; compare reports the change between two runs
+ *      and exits with status 1 if any case slowed by more than a threshold.
+ *          python benchmarks/NavBench.py run [-o results.json] [-s sizes...]
+ *                  [-r repeat] [-k pattern]
+ *          python benchmarks/NavBench.py compare base.json new.json
+ *                  [-t threshold] [-m minSeconds]
+ *      Scalar cases call the NavUtils/Geometry method once per position;
+ *      batch cases make one NavBatch/Geometry array call for all of them.
+ *      The time kept is the best of repeat runs.  The polar regime lies
+ *      above 85 degrees, where rhumb_line switches to the great circle,
+ *      the approximate modes fall back to it and tracks cross the pole.
+ *      The routines built on a bearing (CalculateBearing, CalculateCPA,
+ *      CalculatePerpendicularDistance and the Graham scan's angle order)
+ *      reject such positions by design: those calls (LatitudeLimitError,
+ *      or the invalid flag and code of the batch versions) are counted as
+ *      rejected, not as errors, and still timed.  Calls that raise
+ *      anything else are counted as errors.  The O(n^2) Graham scan and the
+ *      scalar cases are skipped above OLD_PATH_LIMIT and SCALAR_LIMIT
+ *      positions.  A case found in only one of the two compared runs is
+ *      reported and fails the comparison like a regression.
+ *****************************************************************************
+'''
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from NavUtils import NavUtils
+from NavUtils import BearingType
+from NavUtils import AccuracyMode
+from NavBatch import NavBatch
+from Geometry import Geometry
+from GeographicPosition import GeographicPosition
+from Point import Point
+from NavException import LatitudeLimitError
+from CPA_Data import CPA_State
+
+OLD_PATH_LIMIT = 5000
+SCALAR_LIMIT = 10000
+
+# Regime -> [latitude range, longitude range] of the first positions
+REGIMES = {
+    'equatorial': [(-10.0, 10.0), (-60.0, 60.0)],
+    'high-latitude': [(60.0, 82.0), (-180.0, 180.0)],
+    'antimeridian': [(-50.0, 50.0), (175.0, 185.0)],
+    'polar': [(85.0, 89.5), (-180.0, 180.0)],
+}
+
+class BenchData(object):
+    """ Random tracks for one regime and size, as arrays and as position objects. """
+
+    def __init__(self, theRegime, theSize, theSeed):
+        rng = np.random.default_rng(theSeed)
+        (lat_min, lat_max), (lon_min, lon_max) = REGIMES[theRegime]
+        self.size = theSize
+        self.lat1 = rng.uniform(lat_min, lat_max, theSize)
+        self.lon1 = self.wrap(rng.uniform(lon_min, lon_max, theSize))
+        self.lat2 = np.clip(self.lat1 + rng.uniform(-2.0, 2.0, theSize), -89.9, 89.9)
+        self.lon2 = self.wrap(self.lon1 + rng.uniform(-2.0, 2.0, theSize))
+        self.lat3 = np.clip(self.lat1 + rng.uniform(-2.0, 2.0, theSize), -89.9, 89.9)
+        self.lon3 = self.wrap(self.lon1 + rng.uniform(-2.0, 2.0, theSize))
+        self.course1 = rng.uniform(0.0, 360.0, theSize)
+        self.course2 = rng.uniform(0.0, 360.0, theSize)
+        self.speed1 = rng.uniform(5.0, 25.0, theSize)
+        self.speed2 = rng.uniform(5.0, 25.0, theSize)
+        self.distance = rng.uniform(0.5, 120.0, theSize)
+        self.fraction = rng.uniform(0.0, 1.0, theSize)
+        self.objects = None
+
+    def wrap(self, theLongitudes):
+        return (theLongitudes + 180.0) % 360.0 - 180.0
+
+    def positions(self):
+        """ Return [starts, ends, thirds, points1, points2], built once and only for scalar cases. """
+        if self.objects is None:
+            self.objects = [[GeographicPosition(a, b) for a, b in zip(self.lat1.tolist(), self.lon1.tolist())],
+                            [GeographicPosition(a, b) for a, b in zip(self.lat2.tolist(), self.lon2.tolist())],
+                            [GeographicPosition(a, b) for a, b in zip(self.lat3.tolist(), self.lon3.tolist())],
+                            Point.fromArrays(self.lat1, self.lon1),
+                            Point.fromArrays(self.lat2, self.lon2)]
+        return self.objects
+
+
+def each(theFunction, *theArgLists):
+    """
+        Call theFunction once per row of the argument lists; returns [errors, rejected], the
+        number of calls that raised and of those rejected with LatitudeLimitError.
+    """
+    errors = 0
+    rejected = 0
+    for args in zip(*theArgLists):
+        try:
+            theFunction(*args)
+        except LatitudeLimitError:
+            rejected += 1
+        except (ArithmeticError, ValueError):
+            errors += 1
+    return [errors, rejected]
+
+def once(theFunction, *theArgs):
+    """ Call theFunction once; returns [errors, rejected] as each does. """
+    return each(theFunction, *[[arg] for arg in theArgs])
+
+
+class NavBench(object):
+
+    def __init__(self):
+        self.nav = NavUtils()
+        self.batch = NavBatch()
+        self.geometry = Geometry()
+
+    def cases(self):
+        """ Return [name, kind, limit, run] for every case; run(data) returns [errors, rejected]. """
+        nav = self.nav
+        batch = self.batch
+        geometry = self.geometry
+        absolute = BearingType.ABSOLUTE
+        equirectangular = AccuracyMode.EQUIRECTANGULAR
+        return [
+            ['GreatCircle', 'scalar', SCALAR_LIMIT,
+             lambda d: each(nav.GreatCircle, d.lat1.tolist(), d.lon1.tolist(), d.course1.tolist(), d.distance.tolist())],
+            ['GreatCircleRange', 'scalar', SCALAR_LIMIT,
+             lambda d: each(nav.GreatCircleRange, d.positions()[0], d.positions()[1])],
+            ['rhumb_line', 'scalar', SCALAR_LIMIT,
+             lambda d: each(nav.rhumb_line, d.lat1.tolist(), d.lon1.tolist(), d.course1.tolist(), d.distance.tolist())],
+            ['CalculateBearing', 'scalar', SCALAR_LIMIT,
+             lambda d: each(lambda s, e: nav.CalculateBearing(0.0, s, e, absolute), d.positions()[0], d.positions()[1])],
+            ['CalculateCPA', 'scalar', SCALAR_LIMIT,
+             lambda d: each(nav.CalculateCPA, d.positions()[0], d.course1.tolist(), d.speed1.tolist(),
+                            d.positions()[1], d.course2.tolist(), d.speed2.tolist())],
+            ['CalculatePerpendicularDistance', 'scalar', SCALAR_LIMIT,
+             lambda d: each(nav.CalculatePerpendicularDistance, d.positions()[2], d.positions()[0], d.positions()[1])],
+            ['findMinimumDistanceIndices', 'scalar', SCALAR_LIMIT,
+             lambda d: once(nav.findMinimumDistanceIndices, d.positions()[3], d.positions()[4])],
+            ['NewPositionFraction', 'scalar', SCALAR_LIMIT,
+             lambda d: each(nav.NewPositionFraction, d.positions()[0], d.positions()[1], d.fraction.tolist())],
+            ['grahamScan', 'scalar', OLD_PATH_LIMIT,
+             lambda d: once(lambda p: geometry.grahamScan(geometry.orderByAngle(p)), d.positions()[3])],
+            ['convexHull', 'scalar', SCALAR_LIMIT,
+             lambda d: once(geometry.convexHull, d.positions()[3])],
+            ['GreatCircle.equirectangular', 'scalar', SCALAR_LIMIT,
+             lambda d: each(lambda lat, lon, course, distance: nav.GreatCircle(lat, lon, course, distance, mode=equirectangular),
+                            d.lat1.tolist(), d.lon1.tolist(), d.course1.tolist(), d.distance.tolist())],
+            ['GreatCircle', 'batch', None,
+             lambda d: once(batch.GreatCircle, d.lat1, d.lon1, d.course1, d.distance)],
+            ['GreatCircleRange', 'batch', None,
+             lambda d: once(batch.GreatCircleRange, d.lat1, d.lon1, d.lat2, d.lon2)],
+            ['CalculateBearing', 'batch', None,
+             lambda d: [0, int(batch.CalculateBearing(0.0, d.lat1, d.lon1, d.lat2, d.lon2, absolute)[1].sum())]],
+            ['CalculateCPA', 'batch', None,
+             lambda d: [0, int(np.count_nonzero(batch.CalculateCPA(np.column_stack((d.lat1, d.lon1)), d.course1, d.speed1,
+                                                                   np.column_stack((d.lat2, d.lon2)), d.course2, d.speed2)['code']
+                                                == CPA_State.INVALID.value))]],
+            ['GreatCircle.equirectangular', 'batch', None,
+             lambda d: once(lambda: batch.GreatCircle(d.lat1, d.lon1, d.course1, d.distance, mode=equirectangular))],
+            ['CrossTrackDistance', 'batch', None,
+             lambda d: once(batch.CrossTrackDistance, d.lat3, d.lon3, d.lat1, d.lon1, d.lat2, d.lon2)],
+            ['NewPositionFraction', 'batch', None,
+             lambda d: once(batch.NewPositionFraction, d.lat1, d.lon1, d.lat2, d.lon2, d.fraction)],
+            ['convexHullIndices', 'batch', None,
+             lambda d: once(geometry.convexHullIndices, d.lat1, d.lon1)],
+        ]
+
+    def run(self, theSizes, theRepeat = 3, thePattern = None):
+        """ Time the cases whose 'kind.name/regime' matches thePattern; returns the result records. """
+        pattern = re.compile(thePattern) if thePattern else None
+        records = []
+        for regime_ix, regime in enumerate(REGIMES):
+            for size in theSizes:
+                data = BenchData(regime, size, 1000 * regime_ix + size)
+                for name, kind, limit, run in self.cases():
+                    label = kind + '.' + name + '/' + regime
+                    if pattern is not None and not pattern.search(label):
+                        continue
+                    if limit is not None and size > limit:
+                        continue
+                    if kind == 'scalar':
+                        data.positions()    # Build the objects outside the timed runs
+                    best = None
+                    for i in range(max(1, theRepeat)):
+                        start = time.perf_counter()
+                        errors, rejected = run(data)
+                        elapsed = time.perf_counter() - start
+                        best = elapsed if best is None else min(best, elapsed)
+                    records.append({'case': kind + '.' + name, 'regime': regime, 'size': size,
+                                    'seconds': best, 'perItemNs': 1.0e9 * best / size, 'errors': errors,
+                                    'rejected': rejected})
+                    sys.stderr.write("%-42s %-14s %9d %12.6f s %8d errors %8d rejected\n"
+                                     % (kind + '.' + name, regime, size, best, errors, rejected))
+        return records
+
+    def environment(self):
+        return {'python': platform.python_version(), 'numpy': np.__version__,
+                'machine': platform.machine(), 'system': platform.system(), 'processor': platform.processor(),
+                'cpus': os.cpu_count(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+    def compare(self, theBase, theNew, theThreshold = 0.10, theMinSeconds = 0.001):
+        """
+            Compare two result files.  Returns [rows, regressions, missing]: one row per case,
+            regime and size in both runs, those that slowed by more than theThreshold (a fraction)
+            and [key, 'base' or 'new'] for each case found only in that run.  Cases faster than
+            theMinSeconds in both runs are too noisy to flag.
+        """
+        def keyed(theResults):
+            return {(r['case'], r['regime'], r['size']): r for r in theResults['results']}
+        base = keyed(theBase)
+        new = keyed(theNew)
+        rows = []
+        regressions = []
+        for key in sorted(set(base) & set(new)):
+            ratio = new[key]['seconds'] / base[key]['seconds'] if base[key]['seconds'] > 0.0 else float('inf')
+            flagged = ratio > 1.0 + theThreshold and max(base[key]['seconds'], new[key]['seconds']) >= theMinSeconds
+            row = [key, base[key]['seconds'], new[key]['seconds'], ratio, flagged]
+            rows.append(row)
+            if flagged:
+                regressions.append(row)
+        missing = [[key, 'base'] for key in sorted(set(base) - set(new))] + \
+                  [[key, 'new'] for key in sorted(set(new) - set(base))]
+        return [rows, regressions, missing]
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Benchmark the navigation routines.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="time the cases and write the results")
+    run_parser.add_argument('-o', '--output', default='navbench.json', help="results file (JSON)")
+    run_parser.add_argument('-s', '--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    run_parser.add_argument('-r', '--repeat', type=int, default=3, help="runs per case; the best is kept")
+    run_parser.add_argument('-k', '--pattern', default=None, help="only cases whose kind.name/regime matches")
+    compare_parser = commands.add_parser('compare', help="flag regressions between two result files")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('-t', '--threshold', type=float, default=0.10,
+                                help="slowdown (fraction) flagged as a regression")
+    compare_parser.add_argument('-m', '--min-seconds', type=float, default=0.001,
+                                help="ignore cases faster than this in both runs")
+    args = parser.parse_args(argv)
+
+    bench = NavBench()
+    if args.command == 'run':
+        results = {'environment': bench.environment(), 'sizes': args.sizes, 'repeat': args.repeat,
+                   'results': bench.run(args.sizes, args.repeat, args.pattern)}
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=1)
+        return 0
+
+    with open(args.base) as base_file, open(args.new) as new_file:
+        rows, regressions, missing = bench.compare(json.load(base_file), json.load(new_file), args.threshold, args.min_seconds)
+    print("%-42s %-14s %9s %12s %12s %8s" % ("case", "regime", "size", "base (s)", "new (s)", "ratio"))
+    for (case, regime, size), base_seconds, new_seconds, ratio, flagged in rows:
+        print("%-42s %-14s %9d %12.6f %12.6f %8.3f%s" % (case, regime, size, base_seconds, new_seconds, ratio,
+                                                          "  REGRESSION" if flagged else ""))
+    for (case, regime, size), run in missing:
+        print("%-42s %-14s %9d only in the %s run" % (case, regime, size, run))
+    print(str(len(regressions)) + " regression(s) above " + str(100.0 * args.threshold) + "%, "
+          + str(len(missing)) + " case(s) in only one run")
+    return 1 if regressions or missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Memory benchmark for the position value types
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Builds N GeographicPosition, Point and CPAData objects with the
+ *      current slotted classes and with copies of the former __dict__
+ *      classes, and reports the memory traced per object.
+ *          python benchmarks/PositionMemory.py [N]      (default 10,000,000)
+ *      10M positions with the old layout need several GB of memory.
+ *****************************************************************************
+'''
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from GeographicPosition import GeographicPosition
+from Point import Point
+from CPA_Data import CPAData
+from CPA_Data import CPA_State
+
+class DictPosition():
+    """ GeographicPosition before __slots__ """
+    def __init__(self, lat, lon):
+        self.latitude = lat
+        self.longitude = lon
+
+class DictPoint():
+    """ Point before __slots__: RADIUS per instance and x, y, z always computed """
+    def __init__(self, lat, lon):
+        self.RADIUS = 10.0
+        self.lat = lat
+        self.lon = lon
+        self.x = self.RADIUS * math.cos(math.radians(lon)) * math.cos(math.radians(lat))
+        self.y = self.RADIUS * math.sin(math.radians(lon)) * math.cos(math.radians(lat))
+        self.z = self.RADIUS * math.sin(math.radians(lat))
+
+class DictCPAData():
+    """ CPAData before __slots__, with its throw-away default position """
+    def __init__(self, lat, lon):
+        self.cpaPosition = DictPosition(0.0, 0.0)
+        self.distToCPA = 0.0
+        self.elapsedTime = 0.0
+        self.rangeAtCPA = 0.0
+        self.code = CPA_State.VALID
+        self.cpaPosition = DictPosition(lat, lon)
+
+def newCPAData(lat, lon):
+    cpa = CPAData()
+    cpa.setCpaPosition(GeographicPosition(lat, lon))
+    return cpa
+
+def measure(factory, count):
+    """ Return [bytes per object, seconds] to build count objects. """
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = [factory(i * 1.0e-6, -i * 1.0e-6) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return [size / count, elapsed]
+
+def main(count):
+    cases = [["GeographicPosition", DictPosition, GeographicPosition],
+             ["Point", DictPoint, Point],
+             ["CPAData", DictCPAData, newCPAData]]
+    print("%d objects of each type" % count)
+    print("%-20s %14s %14s %10s" % ("Type", "before B/obj", "after B/obj", "saving"))
+    for name, before, after in cases:
+        old_size, old_time = measure(before, count)
+        new_size, new_time = measure(after, count)
+        print("%-20s %14.1f %14.1f %9.1f%%   (%.2fs -> %.2fs, %.2f GB -> %.2f GB)" %
+              (name, old_size, new_size, 100.0 * (1.0 - new_size / old_size), old_time, new_time,
+               old_size * count / 1.0e9, new_size * count / 1.0e9))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000000)
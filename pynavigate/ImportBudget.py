@@ -0,0 +1,86 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     Import-time budget for the pynavigate package
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      Each statement is timed in fresh interpreters (the median of several
+ *      runs, after one run to write the byte code) and compared with its
+ *      budget.  The statements must also leave the heavy modules unloaded.
+ *      Run from the repository root:
+ *          python -m pynavigate.ImportBudget
+ *      The exit status is 1 if any budget is exceeded.  A test runner can
+ *      call check() instead, which returns the failures without printing:
+ *          assert ImportBudget.check() == []
+ *****************************************************************************
+'''
+import os
+import subprocess
+import sys
+
+# Statement -> [budget in milliseconds, heavy modules it must not load]
+BUDGETS = {
+    'import pynavigate': [5.0, ('numpy', 'gi')],
+    'import pynavigate; pynavigate.NavUtils': [20.0, ('numpy', 'gi')],
+    'import pynavigate; pynavigate.Geometry': [20.0, ('numpy', 'gi')],
+    'import pynavigate; pynavigate.NavBatch': [400.0, ('gi',)],
+}
+
+RUNS = 7
+
+TIMER = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = 1000.0 * (time.perf_counter() - start)
+print(elapsed)
+print(' '.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+def measure(statement, heavy, runs = RUNS):
+    """ Return [median milliseconds, heavy modules loaded] for an import statement. """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    code = TIMER.format(statement=statement, heavy=tuple(heavy))
+    times = []
+    loaded = ''
+    for run in range(runs + 1):
+        out = subprocess.run([sys.executable, '-c', code], cwd=root, env=env,
+                             capture_output=True, text=True, check=True).stdout.split('\n')
+        if run > 0:
+            times.append(float(out[0]))
+        loaded = out[1].strip()
+    times.sort()
+    return [times[len(times) // 2], loaded]
+
+def check(budgets = BUDGETS, verbose = False):
+    """
+        Measure every statement and return the list of failure messages, empty when every
+        budget is met.  With verbose each time is printed against its budget.
+    """
+    failures = []
+    for statement, (budget, heavy) in budgets.items():
+        elapsed, loaded = measure(statement, heavy)
+        if verbose:
+            print("%8.2f ms  (budget %7.2f ms)  %s" % (elapsed, budget, statement))
+        if elapsed > budget:
+            failures.append(statement + " took " + str(round(elapsed, 2)) + " ms, over its budget")
+        if loaded:
+            failures.append(statement + " loaded " + loaded)
+    return failures
+
+
+def main():
+    failures = check(verbose=True)
+    for failure in failures:
+        print("FAIL: " + failure)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+'''
+ *****************************************************************************
+ * PURPOSE
+ *     The PyNavigate package
+ *        Lazy access to the navigation classes and constants
+ *
+ *****************************************************************************
+ * MODIFICATIONS
+ * @author JL Sowers Oct 17, 2026
+ *****************************************************************************
+ *  DESIGN NOTES:
+ *      An alias layer, not an installable package: there is no packaging
+ *      metadata and the modules are not moved into it.  They stay flat in
+ *      the repository root, which must be on sys.path, and
+ *      pynavigate.NavUtils is the same class as NavUtils.NavUtils.
+ *      "import pynavigate" imports nothing else.  Each public name is looked
+ *      up in LAZY_NAMES and its module is imported on first attribute access,
+ *      so a worker only pays for what it uses (NumPy is only loaded by the
+ *      batch classes and GTK never is).
+ *****************************************************************************
+'''
+import importlib
+
+# Public name -> module that defines it
+LAZY_NAMES = {
+    'NavCommon': 'NavCommon',
+    'NavUtils': 'NavUtils',
+    'BearingType': 'NavUtils',
+    'AccuracyMode': 'NavUtils',
+    'GeographicPosition': 'GeographicPosition',
+    'Point': 'Point',
+    'PreparedPosition': 'PreparedPosition',
+    'CPAData': 'CPA_Data',
+    'CPA_State': 'CPA_Data',
+    'Geometry': 'Geometry',
+    'Orientation': 'Orientation',
+    'Stack': 'Stack',
+    'NavException': 'NavException',
+    'LatitudeLimitError': 'NavException',
+    'TimeRangeError': 'NavException',
+    'AntipodalError': 'NavException',
+    'NavBatch': 'NavBatch',
+    'CPA_DTYPE': 'NavBatch',
+    'CPAScreen': 'CPAScreen',
+    'CPA_PAIR_DTYPE': 'CPAScreen',
+    'SpatialGrid': 'SpatialGrid',
+    'KDTree': 'KDTree',
+    'Route': 'Route',
+    'NavParallel': 'NavParallel',
+    'NavCLI': 'NavCLI',
+    'NavService': 'NavService',
+    'NavStats': 'NavStats',
+    'NAV_STATS': 'NavStats',
+    'CachedNavUtils': 'NavCache',
+    'LRUCache': 'NavCache',
+    'Track': 'Track',
+    'TrackFix': 'Track',
+    'IncrementalHull': 'IncrementalHull',
+    'GeofenceIndex': 'Geofence',
+}
+
+__all__ = sorted(LAZY_NAMES)
+
+def __getattr__(name):
+    module = LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError("module 'pynavigate' has no attribute '" + name + "'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))